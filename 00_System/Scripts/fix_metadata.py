@@ -1,1070 +1,520 @@
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
 import os
-
-
-
-
-
-
-
 import re
-
-
-
-
-
-
-
 import shutil
-
-
-
-
-
-
-
+import struct
 import subprocess
-
-
-
-
-
-
-
+import tempfile
 import argparse
-
-
-
-
-
-
-
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Native creation-time support on Windows; elsewhere os.utime is all there is
+if os.name == "nt":
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.CreateFileW.restype = wintypes.HANDLE
+        kernel32.CreateFileW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                                         wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE]
+        kernel32.SetFileTime.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.FILETIME),
+                                         ctypes.POINTER(wintypes.FILETIME), ctypes.POINTER(wintypes.FILETIME)]
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+    except (ImportError, OSError, AttributeError):
+        kernel32 = None
+else:
+    kernel32 = None
+
+FILE_WRITE_ATTRIBUTES = 0x100
+FILE_SHARE_ALL = 0x7
+OPEN_EXISTING = 3
+FILE_FLAG_BACKUP_SEMANTICS = 0x02000000
+# 100-nanosecond intervals between 1601-01-01 (FILETIME) and 1970-01-01 (Unix)
+FILETIME_EPOCH_OFFSET = 116444736000000000
+# Files per PowerShell process when the native path isn't available
+POWERSHELL_BATCH_SIZE = 500
+
+# Regex to find dates in filenames
+# Pattern 1: VID-YYYYMMDD or IMG-YYYYMMDD
+PATTERN_COMPACT = re.compile(r"(?:VID|IMG)-(\d{8})")
+# Pattern 2: WhatsApp Image YYYY-MM-DD or WhatsApp Video YYYY-MM-DD
+PATTERN_WHATSAPP = re.compile(r"WhatsApp (?:Image|Video) (\d{4}-\d{2}-\d{2})")
+
+# EXIF tags: IFD0 DateTime, pointer to the Exif sub-IFD, and DateTimeOriginal inside it
+TAG_DATETIME = 0x0132
+TAG_EXIF_IFD = 0x8769
+TAG_DATETIME_ORIGINAL = 0x9003
+# QuickTime counts seconds from 1904-01-01 UTC
+QUICKTIME_EPOCH_OFFSET = 2082844800
+QUICKTIME_CONTAINERS = (b"moov", b"trak", b"mdia")
+
+def parse_exif_datetime(raw):
+    """
+    Parses an EXIF 'YYYY:MM:DD HH:MM:SS' value. Blank or zeroed dates give None.
+    """
+    text = raw.split(b"\x00", 1)[0].decode("ascii", "ignore").strip()
+    try:
+        return datetime.strptime(text[:19], "%Y:%m:%d %H:%M:%S")
+    except ValueError:
+        return None
 
+def read_tiff_date(tiff):
+    """
+    Reads DateTimeOriginal (falling back to DateTime) from a TIFF/EXIF block.
+    """
+    if tiff[:2] == b"II":
+        endian = "<"
+    elif tiff[:2] == b"MM":
+        endian = ">"
+    else:
+        return None
+
+    def ifd_entries(offset):
+        if offset + 2 > len(tiff):
+            return {}
+        count = struct.unpack_from(endian + "H", tiff, offset)[0]
+        entries = {}
+        for i in range(count):
+            pos = offset + 2 + i * 12
+            if pos + 12 > len(tiff):
+                break
+            tag, type_, n = struct.unpack_from(endian + "HHI", tiff, pos)
+            entries[tag] = (type_, n, pos + 8)
+        return entries
+
+    def ascii_value(entry):
+        type_, n, pos = entry
+        if type_ != 2:
+            return None
+        # Values longer than 4 bytes live at an offset instead of inline
+        if n > 4:
+            pos = struct.unpack_from(endian + "I", tiff, pos)[0]
+        return tiff[pos:pos + n]
+
+    ifd0 = ifd_entries(struct.unpack_from(endian + "I", tiff, 4)[0])
+    if TAG_EXIF_IFD in ifd0:
+        exif_offset = struct.unpack_from(endian + "I", tiff, ifd0[TAG_EXIF_IFD][2])[0]
+        exif = ifd_entries(exif_offset)
+        if TAG_DATETIME_ORIGINAL in exif:
+            date = parse_exif_datetime(ascii_value(exif[TAG_DATETIME_ORIGINAL]) or b"")
+            if date:
+                return date
+    if TAG_DATETIME in ifd0:
+        return parse_exif_datetime(ascii_value(ifd0[TAG_DATETIME]) or b"")
+    return None
+
+def read_jpeg_date(f):
+    """
+    Walks the JPEG marker segments up to the image data, reading only the APP1 Exif block.
+    """
+    f.seek(2)
+    while True:
+        header = f.read(4)
+        if len(header) < 4 or header[0] != 0xFF:
+            return None
+        marker, length = header[1], struct.unpack(">H", header[2:])[0]
+        # Start of scan: the metadata segments are over
+        if marker == 0xDA:
+            return None
+        if marker == 0xE1:
+            segment = f.read(length - 2)
+            if segment[:6] == b"Exif\x00\x00":
+                return read_tiff_date(segment[6:])
+        else:
+            f.seek(length - 2, os.SEEK_CUR)
 
+def read_quicktime_date(f, file_size):
+    """
+    Finds the mvhd atom of an MP4/MOV by seeking from atom to atom, so the media data is never read.
+    """
+    def find_mvhd(start, end):
+        pos = start
+        while pos + 8 <= end:
+            f.seek(pos)
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            size, kind = struct.unpack(">I4s", header)
+            header_size = 8
+            if size == 1:
+                # 64-bit atom size follows the type
+                size = struct.unpack(">Q", f.read(8))[0]
+                header_size = 16
+            elif size == 0:
+                size = end - pos
+            if size < header_size:
+                return None
+            if kind == b"mvhd":
+                version = f.read(4)[0]
+                if version == 1:
+                    return struct.unpack(">Q", f.read(8))[0]
+                return struct.unpack(">I", f.read(4))[0]
+            if kind in QUICKTIME_CONTAINERS:
+                found = find_mvhd(pos + header_size, pos + size)
+                if found is not None:
+                    return found
+            pos += size
+        return None
+
+    seconds = find_mvhd(0, file_size)
+    if not seconds:
+        return None
+    try:
+        return datetime.fromtimestamp(seconds - QUICKTIME_EPOCH_OFFSET)
+    except (OverflowError, OSError, ValueError):
+        return None
 
+def get_embedded_date(file_path):
+    """
+    Returns the capture date stored inside a photo (EXIF) or video (mvhd atom), or None.
+    The format is recognised from the first bytes, so misnamed files are handled too.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            head = f.read(12)
+            if head[:3] == b"\xff\xd8\xff":
+                return read_jpeg_date(f)
+            if head[:4] in (b"II*\x00", b"MM\x00*"):
+                f.seek(0)
+                return read_tiff_date(f.read(256 * 1024))
+            if head[4:8] in (b"ftyp", b"moov", b"mdat", b"wide", b"free"):
+                return read_quicktime_date(f, os.fstat(f.fileno()).st_size)
+    except (OSError, struct.error, IndexError):
+        pass
+    return None
+
+def get_filename_date(filename):
+    """
+    Returns the date encoded in a VID-/IMG-YYYYMMDD or WhatsApp-style filename, or None.
+    """
+    try:
+        match = PATTERN_COMPACT.search(filename)
+        if match:
+            return datetime.strptime(match.group(1), "%Y%m%d")
+        match = PATTERN_WHATSAPP.search(filename)
+        if match:
+            return datetime.strptime(match.group(1), "%Y-%m-%d")
+    except ValueError:
+        pass
+    return None
+
+def to_filetime(new_date):
+    """
+    Converts a datetime to a Windows FILETIME count (100ns ticks since 1601).
+    """
+    return int(new_date.timestamp() * 10_000_000) + FILETIME_EPOCH_OFFSET
 
-
-
-
-
-
-
-
-
-
+def set_creation_time_native(file_path, new_date):
+    """
+    Sets the Windows creation time through SetFileTime. Returns False if that isn't possible.
+    """
+    if kernel32 is None:
+        return False
+    handle = kernel32.CreateFileW(file_path, FILE_WRITE_ATTRIBUTES, FILE_SHARE_ALL, None,
+                                  OPEN_EXISTING, FILE_FLAG_BACKUP_SEMANTICS, None)
+    if handle is None or handle == INVALID_HANDLE_VALUE:
+        return False
+    try:
+        ticks = to_filetime(new_date)
+        created = wintypes.FILETIME(ticks & 0xFFFFFFFF, ticks >> 32)
+        return bool(kernel32.SetFileTime(handle, ctypes.byref(created), None, None))
+    finally:
+        kernel32.CloseHandle(handle)
 
 def set_file_times(file_path, new_date):
-
-
-
-
-
-
-
     """
-
-
-
-
-
-
-
+    Sets the modification (and access) time with os.utime, and on Windows the creation time
+    with SetFileTime. Returns False when the creation time still needs setting another way.
+    """
+    timestamp = new_date.timestamp()
+    try:
+        os.utime(file_path, (timestamp, timestamp))
+    except OSError as e:
+        if os.name == "nt":
+            return False
+        print(f"Error updating metadata for {os.path.basename(file_path)}: {e}")
+        return True
+    if os.name != "nt":
+        # Linux has no settable creation time; macOS derives it from the earliest mtime
+        return True
+    return set_creation_time_native(file_path, new_date)
+
+def set_file_times_batch(items):
+    """
+    Sets creation and last write times for many files with one PowerShell process per
+    POWERSHELL_BATCH_SIZE files. Each batch is written to a temporary UTF-8 (with BOM)
+    .ps1 script, so non-ASCII paths survive and there is no command-line length limit.
+    Failures are reported by their index in the batch. Returns the (path, date) pairs
+    that still failed; if the script did not run to the end, the whole batch counts
+    as failed.
+    """
+    failed = []
+    for start in range(0, len(items), POWERSHELL_BATCH_SIZE):
+        batch = items[start:start + POWERSHELL_BATCH_SIZE]
+        lines = []
+        for index, (file_path, new_date) in enumerate(batch):
+            literal = file_path.replace("'", "''")
+            ticks = to_filetime(new_date)
+            lines.append(
+                f"try {{ $item = Get-Item -LiteralPath '{literal}' -ErrorAction Stop; "
+                f"$item.CreationTime = [DateTime]::FromFileTime({ticks}); "
+                f"$item.LastWriteTime = [DateTime]::FromFileTime({ticks}) }} "
+                f"catch {{ Write-Output 'FAILED:{index}' }}"
+            )
+        lines.append("Write-Output 'DONE'")
+        fd, script = tempfile.mkstemp(suffix=".ps1")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8-sig") as f:
+                f.write("\n".join(lines) + "\n")
+            result = subprocess.run(
+                ["powershell", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass", "-File", script],
+                capture_output=True,
+                text=True
+            )
+            output = result.stdout.splitlines()
+            if "DONE" not in output:
+                failed += batch
+                continue
+            bad = {int(line[len("FAILED:"):]) for line in output if line.startswith("FAILED:")}
+            failed += [batch[i] for i in sorted(bad)]
+        except OSError:
+            failed += batch
+        finally:
+            try: os.remove(script)
+            except OSError: pass
+    return failed
+
+def set_file_times_powershell(file_path, new_date):
+    """
     Sets the creation and modification time of a file using PowerShell.
-
-
-
-
-
-
-
-    This is necessary for changing the creation time on Windows.
-
-
-
-
-
-
-
+    This is the last resort: it starts one process per file.
     """
-
-
-
-
-
-
-
     try:
-
-
-
-
-
-
-
         # Format for PowerShell: 'YYYY-MM-DD HH:MM:SS'
-
-
-
-
-
-
-
         date_str = new_date.strftime('%Y-%m-%d %H:%M:%S')
 
-
-
-
-
-
-
-        
-
-
-
-
-
-
-
         # PowerShell commands to set creation and last write time
-
-
-
-
-
-
-
         ps_command = (
-
-
-
-
-
-
-
             f'$item = Get-Item -LiteralPath "{file_path}"; '
-
-
-
-
-
-
-
             f'$item.CreationTime = Get-Date "{date_str}"; '
-
-
-
-
-
-
-
             f'$item.LastWriteTime = Get-Date "{date_str}";'
-
-
-
-
-
-
-
         )
 
-
-
-
-
-
-
-        
-
-
-
-
-
-
-
         # Execute the command
-
-
-
-
-
-
-
         subprocess.run(
-
-
-
-
-
-
-
             ["powershell", "-NoProfile", "-Command", ps_command],
-
-
-
-
-
-
-
             check=True,
+            capture_output=True,
+            text=True
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"Error updating metadata for {os.path.basename(file_path)}: {e.stderr}")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
 
+def finish_file_times(pending):
+    """
+    Sets creation times the native path couldn't: batched first, then one file at a time.
+    """
+    if not pending:
+        return
+    print(f"Setting creation time for {len(pending)} file(s) through PowerShell...")
+    for file_path, new_date in set_file_times_batch(pending):
+        set_file_times_powershell(file_path, new_date)
 
+def get_unique_dest_path(dest_path, reserved=None):
+    """
+    Checks if a destination path exists. If so, it appends a number
+    like (1), (2), etc., to the filename until a unique path is found.
+    Paths in `reserved` (claimed by other workers but not written yet) count as taken.
+    """
+    reserved = reserved if reserved is not None else set()
+    if not os.path.exists(dest_path) and dest_path not in reserved:
+        return dest_path
 
+    base, ext = os.path.splitext(dest_path)
+    counter = 1
+    while True:
+        new_dest_path = f"{base}({counter}){ext}"
+        if not os.path.exists(new_dest_path) and new_dest_path not in reserved:
+            return new_dest_path
+        counter += 1
 
+def find_source_files(source_dir, export_dir, recursive=False):
+    """
+    Lists the files to process as paths relative to source_dir.
+    The export folder and this script are never included.
+    """
+    files = []
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        with os.scandir(os.path.join(source_dir, rel_dir)) as it:
+            for entry in it:
+                rel = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and os.path.normcase(entry.path) != os.path.normcase(export_dir):
+                        stack.append(rel)
+                elif entry.is_file() and entry.name != "fix_metadata.py":
+                    files.append(rel)
+    return sorted(files)
+
+class Run:
+    """
+    Shared state for one processing run: claimed destination names, creation times
+    still to set, and per-stage timings summed across workers.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reserved = set()
+        self.pending = []
+        self.timings = {"date": 0.0, "copy": 0.0, "times": 0.0}
+        self.processed = 0
+        self.skipped = 0
+        self.bytes = 0
+
+    def add_time(self, stage, seconds):
+        with self.lock:
+            self.timings[stage] += seconds
+
+    def report(self, message):
+        with self.lock:
+            print(message)
+
+def process_file(run, source_dir, export_dir, rel, move_files):
+    """
+    Dates, copies (or moves) and re-stamps one file. Runs on a worker thread.
+    """
+    source_path = os.path.join(source_dir, rel)
+    filename = os.path.basename(rel)
+
+    start = time.perf_counter()
+    file_date = get_embedded_date(source_path)
+    date_source = "embedded date"
+    if not file_date:
+        file_date = get_filename_date(filename)
+        date_source = "filename"
+    run.add_time("date", time.perf_counter() - start)
+
+    if not file_date:
+        with run.lock:
+            run.skipped += 1
+        run.report(f"Skipping {rel}: no embedded date and does not match any expected name format.")
+        return
 
+    try:
+        # Get a unique destination path to avoid overwriting, keeping the folder layout
+        target_dir = os.path.join(export_dir, os.path.dirname(rel))
+        os.makedirs(target_dir, exist_ok=True)
+        with run.lock:
+            dest_path = get_unique_dest_path(os.path.join(target_dir, filename), run.reserved)
+            run.reserved.add(dest_path)
+        final_filename = os.path.basename(dest_path)
+        size = os.path.getsize(source_path)
+
+        start = time.perf_counter()
+        action_str = "Copied"
+        if move_files:
+            action_str = "Moved"
+            shutil.move(source_path, dest_path)
+        else:
+            shutil.copy2(source_path, dest_path)
+        run.add_time("copy", time.perf_counter() - start)
+
+        # Set the new metadata on the copied/moved file
+        start = time.perf_counter()
+        if not set_file_times(dest_path, file_date):
+            with run.lock:
+                run.pending.append((dest_path, file_date))
+        run.add_time("times", time.perf_counter() - start)
+
+        with run.lock:
+            run.processed += 1
+            run.bytes += size
+        if final_filename == filename:
+            run.report(f"{action_str} and updated metadata for: {rel} ({date_source})")
+        else:
+            run.report(f"{action_str} '{rel}' as '{final_filename}' and updated metadata ({date_source}).")
 
+    except FileNotFoundError:
+        # This can happen if a file is moved and the loop somehow sees it again
+        return
+    except OSError as e:
+        with run.lock:
+            run.skipped += 1
+        run.report(f"Error processing {rel}: {e}")
 
-            capture_output=True,
-
-
-
-
-
-
-
-            text=True
-
-
-
-
-
-
-
-        )
-
-
-
-
-
-
-
-    except subprocess.CalledProcessError as e:
-
-
-
-
-
-
-
-        print(f"Error updating metadata for {os.path.basename(file_path)}: {e.stderr}")
-
-
-
-
-
-
-
-    except Exception as e:
-
-
-
-
-
-
-
-        print(f"An unexpected error occurred: {e}")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-def get_unique_dest_path(dest_path):
-
-
-
-
-
-
-
-    """
-
-
-
-
-
-
-
-    Checks if a destination path exists. If so, it appends a number
-
-
-
-
-
-
-
-    like (1), (2), etc., to the filename until a unique path is found.
-
-
-
-
-
-
-
-    """
-
-
-
-
-
-
-
-    if not os.path.exists(dest_path):
-
-
-
-
-
-
-
-        return dest_path
-
-
-
-
-
-
-
-    
-
-
-
-
-
-
-
-    base, ext = os.path.splitext(dest_path)
-
-
-
-
-
-
-
-    counter = 1
-
-
-
-
-
-
-
-    while True:
-
-
-
-
-
-
-
-        new_dest_path = f"{base}({counter}){ext}"
-
-
-
-
-
-
-
-        if not os.path.exists(new_dest_path):
-
-
-
-
-
-
-
-            return new_dest_path
-
-
-
-
-
-
-
-        counter += 1
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-def process_files(move_files=False):
-
-
-
-
-
-
-
-    """
-
-
-
-
-
-
-
-    Processes files in the current directory to fix their metadata.
-
-
-
-
-
-
-
-    """
-
-
-
-
-
-
-
-    source_dir = os.getcwd()
-
-
-
-
-
-
-
-    export_dir = os.path.join(source_dir, "export")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-    # Create the export directory if it doesn't exist
-
-
-
-
-
-
-
-    if not os.path.exists(export_dir):
-
-
-
-
-
-
-
-        os.makedirs(export_dir)
-
-
-
-
-
-
-
-        print(f"Created directory: {export_dir}")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-    # Regex to find dates in filenames
-
-
-
-
-
-
-
-    # Pattern 1: VID-YYYYMMDD or IMG-YYYYMMDD
-
-
-
-
-
-
-
-    pattern1 = re.compile(r"(?:VID|IMG)-(\d{8})")
-
-
-
-
-
-
-
-    # Pattern 2: WhatsApp Image YYYY-MM-DD or WhatsApp Video YYYY-MM-DD
-
-
-
-
-
-
-
-    pattern2 = re.compile(r"WhatsApp (?:Image|Video) (\d{4}-\d{2}-\d{2})")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-    for filename in os.listdir(source_dir):
-
-
-
-
-
-
-
-        source_path = os.path.join(source_dir, filename)
-
-
-
-
-
-
-
-        # Skip directories and the script itself
-
-
-
-
-
-
-
-        if not os.path.isfile(source_path) or filename == "fix_metadata.py":
-
-
-
-
-
-
-
-            continue
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        file_date = None
-
-
-
-
-
-
-
-        date_str = None
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        match1 = pattern1.search(filename)
-
-
-
-
-
-
-
-        if match1:
-
-
-
-
-
-
-
-            date_str = match1.group(1)
-
-
-
-
-
-
-
-            file_date = datetime.strptime(date_str, "%Y%m%d")
-
-
-
-
-
-
-
-        else:
-
-
-
-
-
-
-
-            match2 = pattern2.search(filename)
-
-
-
-
-
-
-
-            if match2:
-
-
-
-
-
-
-
-                date_str = match2.group(1)
-
-
-
-
-
-
-
-                file_date = datetime.strptime(date_str, "%Y-%m-%d")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        if file_date:
-
-
-
-
-
-
-
-            try:
-
-
-
-
-
-
-
-                # Get a unique destination path to avoid overwriting
-
-
-
-
-
-
-
-                initial_dest_path = os.path.join(export_dir, filename)
-
-
-
-
-
-
-
-                dest_path = get_unique_dest_path(initial_dest_path)
-
-
-
-
-
-
-
-                final_filename = os.path.basename(dest_path)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                action_str = "Copied"
-
-
-
-
-
-
-
-                if move_files:
-
-
-
-
-
-
-
-                    action_str = "Moved"
-
-
-
-
-
-
-
-                    shutil.move(source_path, dest_path)
-
-
-
-
-
-
-
-                else:
-
-
-
-
-
-
-
-                    shutil.copy2(source_path, dest_path)
-
-
-
-
-
-
-
-                
-
-
-
-
-
-
-
-                # Set the new metadata on the copied/moved file
-
-
-
-
-
-
-
-                set_file_times(dest_path, file_date)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                if final_filename == filename:
-
-
-
-
-
-
-
-                    print(f"{action_str} and updated metadata for: {filename}")
-
-
-
-
-
-
-
-                else:
-
-
-
-
-
-
-
-                    print(f"{action_str} '{filename}' as '{final_filename}' and updated metadata.")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            except ValueError:
-
-
-
-
-
-
-
-                print(f"Skipping {filename}: could not parse date '{date_str}'.")
-
-
-
-
-
-
-
-            except FileNotFoundError:
-
-
-
-
-
-
-
-                # This can happen if a file is moved and the loop somehow sees it again
-
-
-
-
-
-
-
-                continue
-
-
-
-
-
-
-
-        else:
-
-
-
-
-
-
-
-            print(f"Skipping {filename}: does not match any expected name format.")
-
-
-
-
-
-
-
-
-
+def process_files(move_files=False, source_dir=None, export_dir=None, recursive=False, jobs=8):
+    """
+    Processes files in the source directory (the current one by default) to fix their metadata.
+    The date embedded in the file (EXIF or QuickTime) is preferred; the filename is the fallback.
+    Files are handled by `jobs` threads so reading, copying and re-stamping overlap, and
+    with `recursive` subfolders are included, keeping their layout under the export folder.
+    """
+    source_dir = os.path.abspath(source_dir or os.getcwd())
+    export_dir = os.path.abspath(export_dir or os.path.join(source_dir, "export"))
 
+    # Create the export directory if it doesn't exist
+    if not os.path.exists(export_dir):
+        os.makedirs(export_dir)
+        print(f"Created directory: {export_dir}")
 
+    wall_start = time.perf_counter()
+    files = find_source_files(source_dir, export_dir, recursive)
+    scan_seconds = time.perf_counter() - wall_start
 
+    run = Run()
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for future in [pool.submit(process_file, run, source_dir, export_dir, rel, move_files) for rel in files]:
+            future.result()
 
+    # Files whose creation time couldn't be set natively
+    start = time.perf_counter()
+    finish_file_times(run.pending)
+    run.timings["times"] += time.perf_counter() - start
 
+    elapsed = time.perf_counter() - wall_start
+    mb = run.bytes / (1024 * 1024)
+    print(f"\n{run.processed} files ({mb:,.1f} MB) processed, {run.skipped} skipped, in {elapsed:.2f}s "
+          f"({run.processed / max(elapsed, 1e-6):,.1f} files/s, {mb / max(elapsed, 1e-6):,.1f} MB/s).")
+    print(f"Stages: scan {scan_seconds:.2f}s, dates {run.timings['date']:.2f}s, "
+          f"copy {run.timings['copy']:.2f}s, timestamps {run.timings['times']:.2f}s "
+          f"(summed across {max(1, jobs)} workers).")
 
 if __name__ == "__main__":
-
-
-
-
-
-
-
     parser = argparse.ArgumentParser(
-
-
-
-
-
-
-
-        description="Fixes metadata of video and image files based on their filename."
-
-
-
-
-
-
-
+        description="Fixes metadata of video and image files based on their embedded dates or filename."
     )
-
-
-
-
-
-
-
     parser.add_argument(
-
-
-
-
-
-
-
         "--move",
-
-
-
-
-
-
-
         action="store_true",
-
-
-
-
-
-
-
         help="Move files to the 'export' directory instead of copying."
-
-
-
-
-
-
-
     )
-
-
-
-
-
-
-
+    parser.add_argument(
+        "--source",
+        help="Folder to process (default: the current directory)."
+    )
+    parser.add_argument(
+        "--dest",
+        help="Where fixed files go (default: an 'export' folder inside the source)."
+    )
+    parser.add_argument(
+        "-r", "--recursive",
+        action="store_true",
+        help="Include subfolders, keeping their layout under the destination."
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=8,
+        help="Number of files processed in parallel (default: 8)."
+    )
     args = parser.parse_args()
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-    process_files(move_files=args.move)
-
-
-
-
-
-
-
+    process_files(move_files=args.move, source_dir=args.source, export_dir=args.dest,
+                  recursive=args.recursive, jobs=args.jobs)
     print("\nProcessing complete.")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
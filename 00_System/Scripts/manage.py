@@ -5,22 +5,38 @@ import datetime
 import sys
 import shutil
 import statistics
-import filecmp
+import random
+import hashlib
 import time
 import stat
+import fnmatch
+import re
+import difflib
 import subprocess
+import threading
+import sqlite3
+import zipfile
 from argparse import RawTextHelpFormatter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 
 # --- RICH IMPORTS ---
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.markdown import Markdown
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeRemainingColumn
+from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeRemainingColumn, DownloadColumn, TransferSpeedColumn
 from rich.prompt import Prompt, Confirm, IntPrompt
 from rich.theme import Theme
 from rich import box
 
+# --- OPTIONAL IMPORTS ---
+try: from watchdog.observers import Observer
+except ImportError: Observer = None
+try: import xxhash
+except ImportError: xxhash = None
+try: from PIL import Image, ImageOps, features as pil_features
+except ImportError: Image = None
+
 # --- RICH SETUP ---
 custom_theme = Theme({
     "info": "cyan",
@@ -34,7 +50,11 @@ console = Console(theme=custom_theme)
 
 # --- CONFIG LOAD ---
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-CONFIG_PATH = os.path.join(SCRIPT_DIR, "..", "Config", "config.json")
+CONFIG_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, "..", "Config"))
+CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
+REGISTRY_PATH = os.path.join(CONFIG_DIR, "registry.db")
+SYNC_JOURNAL_DIR = os.path.join(CONFIG_DIR, "sync_journal")
+SYNC_IGNORE_SUFFIXES = (".bak", ".tmp")
 
 if not os.path.exists(CONFIG_PATH):
     console.print("❌ [error]CRITICAL ERROR: Config file not found.[/error]")
@@ -51,6 +71,69 @@ VAULT_PATH = CONFIG["vault_path"]
 DOWNLOADS_PATH = CONFIG.get("downloads_path", os.path.join(os.path.expanduser("~"), "Downloads"))
 SHUTTLE_PATH = CONFIG.get("shuttle_path", "A:\\CreativeOS_Shuttle")
 ARCHIVE_PATH = CONFIG.get("archive_path", "D:\\OneDrive - Developer\\Archive")
+SCAN_SKIP_DIRS = CONFIG.get("scan_skip_dirs", [
+    "01_Footage", "03_Resolve", "Cache", "node_modules", ".*", "__pycache__", "$RECYCLE.BIN", "System Volume Information"
+])
+COPY_JOBS = CONFIG.get("copy_jobs", 8)
+SMART_DATE_SAMPLE = CONFIG.get("smart_date_sample", 4096)
+SMART_DATE_MAX_FILES = CONFIG.get("smart_date_max_files", 0)
+SMART_DATE_TIME_BUDGET = CONFIG.get("smart_date_time_budget", 0)
+COPY_LARGE_FILE = 64 * 1024 * 1024
+COPY_BUFFER = 16 * 1024 * 1024
+TRAVEL_LOG_NAME = "_TRAVEL_LOG.txt"
+TRAVEL_MANIFEST_NAME = "_TRAVEL_MANIFEST.json"
+RETURN_REPORT_NAME = "_RETURN_REPORT.txt"
+STAGING_SUFFIX = ".cos_partial"
+BUNDLE_SUFFIX = ".cos.zip"
+BUNDLE_INDEX_NAME = ".cos_bundle_index.json"
+BUNDLE_STORED_EXTENSIONS = {
+    ".mp4", ".mov", ".mkv", ".avi", ".webm", ".m4v", ".mxf", ".braw", ".r3d",
+    ".jpg", ".jpeg", ".png", ".webp", ".gif", ".heic",
+    ".mp3", ".aac", ".m4a", ".ogg", ".opus", ".flac",
+    ".zip", ".rar", ".7z", ".gz", ".xz", ".zst"
+}
+THUMB_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+THUMB_STORE_NAME = ".store"
+THUMB_INDEX_NAME = ".mirror_index.json"
+PREVIEW_DIR_NAME = "_Previews"
+PREVIEW_SIZE = CONFIG.get("preview_size", 480)
+PREVIEWS_PER_PAGE = CONFIG.get("previews_per_page", 200)
+CONTACT_SHEET_NAME = "Contact_Sheet"
+CLEAN_MAPPING = {
+    "_Images": [".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".tiff", ".bmp"],
+    "_Video": [".mp4", ".mov", ".avi", ".mkv", ".webm", ".flv", ".wmv"],
+    "_Audio": [".mp3", ".wav", ".aac", ".flac", ".ogg", ".m4a"],
+    "_Docs": [".pdf", ".docx", ".txt", ".xlsx", ".pptx", ".csv", ".md"],
+    "_Installers": [".exe", ".msi", ".iso", ".dmg"],
+    "_Archives": [".zip", ".rar", ".7z", ".tar", ".gz"],
+    "_Fonts": [".ttf", ".otf", ".woff", ".woff2"],
+    "_3D": [".blend", ".fbx", ".obj", ".stl", ".gltf"]
+}
+CLEAN_EXTENSIONS = {ext: folder for folder, extensions in CLEAN_MAPPING.items() for ext in extensions}
+CLEAN_FALLBACK_FOLDER = "_Other"
+CLEAN_RULES = CONFIG.get("clean_rules", [])
+CLEAN_SNIFF = CONFIG.get("clean_sniff", False)
+SNIFF_BYTES = 4096
+DEDUPE_PARTIAL_BYTES = 64 * 1024
+DEDUPE_TRASH_NAME = "_Duplicates"
+VERSION_SUFFIX = re.compile(r"_v\d+$")
+# (offset, magic bytes, folder); RIFF, ISO-BMFF and ZIP containers are told apart in sniff_header.
+SNIFF_SIGNATURES = [
+    (0, b"\xff\xd8\xff", "_Images"), (0, b"\x89PNG\r\n\x1a\n", "_Images"), (0, b"GIF87a", "_Images"), (0, b"GIF89a", "_Images"),
+    (0, b"II*\x00", "_Images"), (0, b"MM\x00*", "_Images"),
+    (0, b"\x1aE\xdf\xa3", "_Video"), (0, b"FLV\x01", "_Video"), (0, b"\x30\x26\xb2\x75\x8e\x66\xcf\x11", "_Video"),
+    (0, b"\x00\x00\x01\xba", "_Video"),
+    (0, b"ID3", "_Audio"), (0, b"fLaC", "_Audio"), (0, b"OggS", "_Audio"), (0, b"\xff\xfb", "_Audio"), (0, b"\xff\xf3", "_Audio"),
+    (0, b"%PDF-", "_Docs"),
+    (0, b"Rar!\x1a\x07", "_Archives"), (0, b"7z\xbc\xaf\x27\x1c", "_Archives"), (0, b"\x1f\x8b", "_Archives"),
+    (0, b"\xfd7zXZ\x00", "_Archives"), (0, b"\x28\xb5\x2f\xfd", "_Archives"), (257, b"ustar", "_Archives"),
+    (0, b"MZ", "_Installers"),
+    (0, b"\x00\x01\x00\x00\x00", "_Fonts"), (0, b"OTTO", "_Fonts"), (0, b"wOFF", "_Fonts"), (0, b"wOF2", "_Fonts"),
+    (0, b"BLENDER", "_3D"), (0, b"glTF", "_3D"),
+]
+SNIFF_RIFF_TYPES = {b"WEBP": "_Images", b"AVI ": "_Video", b"WAVE": "_Audio"}
+SNIFF_FTYP_AUDIO = (b"M4A", b"M4B", b"M4P", b"F4A")
+SNIFF_FTYP_IMAGES = (b"heic", b"heix", b"hevc", b"mif1", b"msf1", b"avif", b"avis")
 
 # --- HELPERS ---
 
@@ -80,94 +163,1434 @@ def find_meta_in_cwd():
         if len(current) < 4: break
     return None, None
 
-def get_smart_date(path):
+def get_smart_date(path, sample_size=None, max_files=None, time_budget=None):
+    """Median file mtime of a folder (or a file's own mtime), streamed with scandir.
+
+    Mtimes go into a fixed-size reservoir sample, so memory stays flat and the
+    median is exact for folders with up to `sample_size` files. The whole tree is
+    walked unless a cap is set: the walk then stops as soon as `max_files` files
+    have been seen or `time_budget` seconds have passed, even partway through a
+    folder, and the estimate comes from the files seen so far. Both caps are off
+    (0) by default, so the result doesn't depend on timing. Hidden files and
+    folders are ignored.
+    """
     if os.path.isfile(path): return os.path.getmtime(path)
-    timestamps = []
-    for root, _, files in os.walk(path):
-        for file in files:
-            if not file.startswith('.'):
-                try: timestamps.append(os.path.getmtime(os.path.join(root, file)))
-                except: pass
-    if not timestamps: return os.path.getmtime(path)
-    return statistics.median(timestamps)
+    sample_size = sample_size or SMART_DATE_SAMPLE
+    max_files = SMART_DATE_MAX_FILES if max_files is None else max_files
+    time_budget = SMART_DATE_TIME_BUDGET if time_budget is None else time_budget
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    rng = random.Random(path)
+    sample, seen = [], 0
+    stack = [path]
+    while stack:
+        try: it = os.scandir(stack.pop())
+        except OSError: continue
+        with it:
+            for e in it:
+                if e.name.startswith('.'): continue
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                        continue
+                    if not e.is_file(): continue
+                    mtime = e.stat().st_mtime
+                except OSError: continue
+                seen += 1
+                if len(sample) < sample_size: sample.append(mtime)
+                else:
+                    slot = rng.randrange(seen)
+                    if slot < sample_size: sample[slot] = mtime
+                if (max_files and seen >= max_files) or (deadline and time.perf_counter() > deadline):
+                    stack = []
+                    break
+    if not sample: return os.path.getmtime(path)
+    return statistics.median(sample)
+
+def hash_file(path, chunk_size=1024 * 1024):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""): h.update(chunk)
+    return h.hexdigest()
+
+def load_sync_journal(key):
+    """Loads the per-file state recorded at the end of the last sync for one project."""
+    path = os.path.join(SYNC_JOURNAL_DIR, f"{key}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f: return json.load(f)
+    except: return {}
+
+def save_sync_journal(key, journal):
+    os.makedirs(SYNC_JOURNAL_DIR, exist_ok=True)
+    path = os.path.join(SYNC_JOURNAL_DIR, f"{key}.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f: json.dump(journal, f)
+    os.replace(path + ".tmp", path)
+
+def build_note_manifest(root):
+    """Maps every syncable file under `root` to [size, mtime_ns] in one scandir pass.
 
-def sync_two_folders(dir_a, dir_b):
-    """Bidirectional Sync: A (Project) <-> B (Vault)"""
+    Keys are '/'-separated paths relative to `root`, so subfolders and embedded
+    attachments are included. Hidden entries (.obsidian, .trash) and .bak/.tmp
+    leftovers are ignored.
+    """
+    manifest = {}
+    stack = [("", root)]
+    while stack:
+        rel, path = stack.pop()
+        try:
+            with os.scandir(path) as it: entries = list(it)
+        except OSError: continue
+        for e in entries:
+            if e.name.startswith("."): continue
+            rel_name = f"{rel}/{e.name}" if rel else e.name
+            if e.is_dir(follow_symlinks=False): stack.append((rel_name, e.path))
+            elif e.is_file() and not e.name.lower().endswith(SYNC_IGNORE_SUFFIXES):
+                st = e.stat()
+                manifest[rel_name] = [st.st_size, st.st_mtime_ns]
+    return manifest
+
+def copy_note(src, dst):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    shutil.copy2(src, dst)
+
+def sync_two_folders(dir_a, dir_b, journal=None):
+    """Bidirectional Sync: A (Project) <-> B (Vault)
+
+    Both trees are read once into a manifest and diffed in memory, so notes in
+    subfolders and their attachments travel too.
+
+    `journal` maps relpath -> {"a": [size, mtime_ns, hash], "b": [...]} as of the
+    last sync and is updated in place. Files whose stat on both sides still
+    matches it are skipped without being opened; otherwise the hashes tell which
+    side actually changed, and only an edit on both sides counts as a conflict.
+    Without a journal entry the old newest-mtime-wins rule applies.
+    """
     if not os.path.exists(dir_a): os.makedirs(dir_a)
     if not os.path.exists(dir_b): os.makedirs(dir_b)
+    if journal is None: journal = {}
 
-    files_a = set(f for f in os.listdir(dir_a) if f.endswith(".md"))
-    files_b = set(f for f in os.listdir(dir_b) if f.endswith(".md"))
-    all_files = files_a.union(files_b)
+    files_a = build_note_manifest(dir_a)
+    files_b = build_note_manifest(dir_b)
+    all_files = set(files_a).union(files_b)
     logs = []
 
-    for filename in all_files:
-        path_a = os.path.join(dir_a, filename)
-        path_b = os.path.join(dir_b, filename)
+    def record(filename, path_a, path_b, digest):
+        st_a, st_b = os.stat(path_a), os.stat(path_b)
+        journal[filename] = {"a": [st_a.st_size, st_a.st_mtime_ns, digest], "b": [st_b.st_size, st_b.st_mtime_ns, digest]}
+
+    for filename in sorted(all_files):
+        path_a = os.path.join(dir_a, *filename.split("/"))
+        path_b = os.path.join(dir_b, *filename.split("/"))
 
         # Case 1: New in A
         if filename in files_a and filename not in files_b:
             try:
-                shutil.copy2(path_a, path_b)
+                copy_note(path_a, path_b)
+                record(filename, path_a, path_b, hash_file(path_a))
                 logs.append({"type": "push", "file": filename, "msg": "Pushed to Vault"})
             except Exception as e: logs.append({"type": "error", "file": filename, "msg": str(e)})
 
         # Case 2: New in B
         elif filename in files_b and filename not in files_a:
             try:
-                shutil.copy2(path_b, path_a)
+                copy_note(path_b, path_a)
+                record(filename, path_a, path_b, hash_file(path_b))
                 logs.append({"type": "pull", "file": filename, "msg": "Pulled from Vault"})
             except Exception as e: logs.append({"type": "error", "file": filename, "msg": str(e)})
 
-        # Case 3: Conflict
+        # Case 3: Present on both sides
         else:
             try:
-                if not filecmp.cmp(path_a, path_b, shallow=False):
-                    mtime_a = os.path.getmtime(path_a)
-                    mtime_b = os.path.getmtime(path_b)
-                    
-                    if mtime_a > mtime_b:
+                sig_a, sig_b = files_a[filename], files_b[filename]
+                entry = journal.get(filename)
+                if entry and entry["a"][:2] == sig_a and entry["b"][:2] == sig_b: continue
+
+                hash_a = entry["a"][2] if entry and entry["a"][:2] == sig_a else hash_file(path_a)
+                hash_b = entry["b"][2] if entry and entry["b"][:2] == sig_b else hash_file(path_b)
+                if hash_a == hash_b:
+                    record(filename, path_a, path_b, hash_a)
+                    continue
+
+                changed_a = entry is None or hash_a != entry["a"][2]
+                changed_b = entry is None or hash_b != entry["b"][2]
+
+                if changed_a and not changed_b:
+                    shutil.copy2(path_a, path_b)
+                    record(filename, path_a, path_b, hash_a)
+                    logs.append({"type": "update_vault", "file": filename, "msg": "Updated Vault"})
+                elif changed_b and not changed_a:
+                    shutil.copy2(path_a, path_a + ".bak")
+                    shutil.copy2(path_b, path_a)
+                    record(filename, path_a, path_b, hash_b)
+                    logs.append({"type": "update_project", "file": filename, "msg": "Updated Project (Backup made)"})
+                elif entry is None:
+                    # No history: fall back to newest-wins.
+                    if sig_a[1] > sig_b[1]:
                         shutil.copy2(path_a, path_b)
+                        record(filename, path_a, path_b, hash_a)
                         logs.append({"type": "update_vault", "file": filename, "msg": "Updated Vault"})
-                    elif mtime_b > mtime_a:
+                    elif sig_b[1] > sig_a[1]:
                         # Create safety backup
                         shutil.copy2(path_a, path_a + ".bak")
                         shutil.copy2(path_b, path_a)
+                        record(filename, path_a, path_b, hash_b)
                         logs.append({"type": "update_project", "file": filename, "msg": "Updated Project (Backup made)"})
                     else:
                         # Timestamps equal but content differs. Force push to Vault to resolve.
                         shutil.copy2(path_a, path_b)
+                        record(filename, path_a, path_b, hash_a)
                         logs.append({"type": "conflict", "file": filename, "msg": "Content mismatch. Forced Push."})
+                else:
+                    # Edited on both sides since the last sync. Newest wins, the other copy is kept as .bak.
+                    if sig_b[1] > sig_a[1]:
+                        shutil.copy2(path_a, path_a + ".bak")
+                        shutil.copy2(path_b, path_a)
+                        record(filename, path_a, path_b, hash_b)
+                        logs.append({"type": "conflict", "file": filename, "msg": "Edited on both sides. Vault kept, project backed up."})
+                    else:
+                        shutil.copy2(path_b, path_b + ".bak")
+                        shutil.copy2(path_a, path_b)
+                        record(filename, path_a, path_b, hash_a)
+                        logs.append({"type": "conflict", "file": filename, "msg": "Edited on both sides. Project kept, vault backed up."})
             except Exception as e: logs.append({"type": "error", "file": filename, "msg": str(e)})
+
+    for filename in list(journal):
+        if filename not in all_files: del journal[filename]
     
     return logs
 
-def copy_with_progress(src, dst):
-    """Copies files from src to dst, showing a rich progress bar."""
+# --- PROJECT DISCOVERY ---
+
+def is_scan_skipped(name, skip=None):
+    skip = SCAN_SKIP_DIRS if skip is None else skip
+    return any(fnmatch.fnmatch(name.lower(), pattern.lower()) for pattern in skip)
+
+def discover_projects(base, skip=None, dir_cache=None, visited=None):
+    """Yields project roots under `base` as soon as they're found.
+
+    Descent stops at any folder holding a .project_meta.json, so footage, caches
+    and node_modules inside a project are never listed. Folders matching the
+    `scan_skip_dirs` patterns from config.json are never entered either.
+
+    `dir_cache` maps path -> (mtime_ns, is_project, children); a folder whose
+    mtime still matches is answered from it without touching the disk. Every
+    folder actually visited is recorded in `visited` in the same shape.
+    """
+    stack = [base]
+    while stack:
+        path = stack.pop()
+        try: mtime = os.stat(path).st_mtime_ns
+        except OSError: continue
+
+        cached = dir_cache.get(path) if dir_cache is not None else None
+        if cached and cached[0] == mtime:
+            is_project, children = cached[1], cached[2]
+        else:
+            try:
+                with os.scandir(path) as it: entries = list(it)
+            except OSError: continue
+            is_project = any(e.name == ".project_meta.json" for e in entries)
+            children = [] if is_project else sorted(e.name for e in entries if e.is_dir(follow_symlinks=False))
+        if visited is not None: visited[path] = (mtime, is_project, children)
+
+        if is_project:
+            yield path
+            continue
+        stack.extend(os.path.join(path, c) for c in reversed(children) if not is_scan_skipped(c, skip))
+
+# --- PROJECT REGISTRY ---
+
+def open_registry():
+    """Opens the SQLite project index in 00_System/Config, creating it on first use."""
+    conn = sqlite3.connect(REGISTRY_PATH)
+    conn.row_factory = sqlite3.Row
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS projects (
+            root TEXT PRIMARY KEY, slug TEXT, name TEXT, type TEXT, client TEXT, meta_mtime INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS projects_slug ON projects (slug);
+        CREATE TABLE IF NOT EXISTS dirs (
+            path TEXT PRIMARY KEY, mtime INTEGER, is_project INTEGER, children TEXT
+        );
+        CREATE TABLE IF NOT EXISTS archive (
+            path TEXT PRIMARY KEY, kind TEXT, name TEXT, slug TEXT, client TEXT, type TEXT,
+            size INTEGER, dir_mtime INTEGER, meta_mtime INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS sniff (
+            size INTEGER, mtime_ns INTEGER, inode INTEGER, folder TEXT, PRIMARY KEY (size, mtime_ns, inode)
+        );
+    """)
+    return conn
+
+def read_project_meta(root):
+    meta_path = os.path.join(root, ".project_meta.json")
+    try:
+        with open(meta_path, "r", encoding="utf-8-sig") as f: return json.load(f)
+    except: return None
+
+def register_project(conn, root, meta, meta_mtime=None):
+    """Upserts a single project row. Used by the scanner and by new/init/clone."""
+    if meta_mtime is None:
+        try: meta_mtime = os.stat(os.path.join(root, ".project_meta.json")).st_mtime_ns
+        except OSError: meta_mtime = 0
+    conn.execute(
+        "INSERT OR REPLACE INTO projects (root, slug, name, type, client, meta_mtime) VALUES (?, ?, ?, ?, ?, ?)",
+        (root, meta.get("slug", os.path.basename(root)), meta.get("name", os.path.basename(root)),
+         meta.get("type", "Video"), meta.get("client", "None"), meta_mtime)
+    )
+
+def load_dir_cache(conn, base):
+    """Cached folder listings for everything under `base`, in discover_projects' dir_cache shape."""
+    rows = conn.execute("SELECT * FROM dirs WHERE path = ? OR substr(path, 1, ?) = ?", (base, len(base) + 1, base + os.sep))
+    return {row["path"]: (row["mtime"], bool(row["is_project"]), json.loads(row["children"])) for row in rows}
+
+def store_dir_cache(conn, cached, visited):
+    conn.executemany(
+        "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?)",
+        [(path, entry[0], int(entry[1]), json.dumps(entry[2])) for path, entry in visited.items() if cached.get(path) != entry]
+    )
+    conn.executemany("DELETE FROM dirs WHERE path = ?", [(p,) for p in cached if p not in visited])
+
+def scan_registry(conn):
+    """Brings the index up to date with PROJECTS_PATH, yielding each project row as it's confirmed.
+
+    Folders whose mtime hasn't moved since the last run reuse their cached child
+    list instead of being listed again, and .project_meta.json is only re-parsed
+    when its own mtime changes.
+    """
+    cached_dirs = load_dir_cache(conn, PROJECTS_PATH)
+    known = {row["root"]: row["meta_mtime"] for row in conn.execute("SELECT root, meta_mtime FROM projects")}
+    visited, seen_projects = {}, set()
+
+    for root in discover_projects(PROJECTS_PATH, dir_cache=cached_dirs, visited=visited):
+        try: meta_mtime = os.stat(os.path.join(root, ".project_meta.json")).st_mtime_ns
+        except OSError: continue
+        if known.get(root) != meta_mtime:
+            meta = read_project_meta(root)
+            if meta is None: continue
+            register_project(conn, root, meta, meta_mtime)
+        seen_projects.add(root)
+        row = conn.execute("SELECT * FROM projects WHERE root = ?", (root,)).fetchone()
+        if row: yield dict(row)
+
+    store_dir_cache(conn, cached_dirs, visited)
+    conn.executemany("DELETE FROM projects WHERE root = ?", [(p,) for p in known if p not in seen_projects])
+    conn.commit()
+
+def refresh_registry(conn):
+    for _ in scan_registry(conn): pass
+
+def iter_projects():
+    """Streams indexed projects in discovery order, refreshing the registry on the way."""
+    conn = open_registry()
+    try: yield from scan_registry(conn)
+    finally: conn.close()
+
+def registry_projects(conn=None):
+    """Returns every indexed project (refreshed first), ordered by slug."""
+    own = conn is None
+    if own: conn = open_registry()
+    try:
+        refresh_registry(conn)
+        return [dict(row) for row in conn.execute("SELECT * FROM projects ORDER BY slug, root")]
+    finally:
+        if own: conn.close()
+
+def registry_add(root, meta):
+    """Records a freshly created/adopted project so the next lookup doesn't need a rescan."""
+    try:
+        conn = open_registry()
+        register_project(conn, root, meta)
+        conn.commit()
+        conn.close()
+    except sqlite3.Error as e:
+        console.print(f"[warning]⚠️  Could not update project registry: {e}[/warning]")
+
+def sync_project_notes(project, vault_projects_dir):
+    """Syncs one registry project's 00_Notes with its vault folder. Safe to run from a worker thread.
+
+    Does nothing if the project has since been archived, moved or deleted, so its
+    notes folder is never recreated from the vault.
+    """
+    if not os.path.isfile(os.path.join(project["root"], ".project_meta.json")): return []
+    project_name = project["slug"] or "Unknown"
+    notes_project = os.path.join(project["root"], "00_Notes")
+    notes_vault = os.path.join(vault_projects_dir, project_name)
+    try:
+        journal = load_sync_journal(project_name)
+        logs = sync_two_folders(notes_project, notes_vault, journal)
+        save_sync_journal(project_name, journal)
+        return logs
+    except Exception as e: return [{"type": "error", "file": "00_Notes", "msg": str(e)}]
+
+def sync_log_symbol(log_type):
+    if log_type == "push": return "→ [green]Push[/green]"
+    if log_type == "pull": return "← [blue]Pull[/blue]"
+    if log_type == "error": return "❌ [red]Error[/red]"
+    if log_type == "conflict": return "⚠️ [yellow]Conflict[/yellow]"
+    return "✅"
+
+class NotesChangeHandler:
+    """watchdog event handler that just marks the owning project dirty; syncing happens on the main loop."""
+    def __init__(self, resolve, mark_dirty):
+        self.resolve = resolve
+        self.mark_dirty = mark_dirty
+
+    def dispatch(self, event):
+        for path in (getattr(event, "src_path", None), getattr(event, "dest_path", None)):
+            if not path: continue
+            if isinstance(path, bytes): path = os.fsdecode(path)
+            slug = self.resolve(path)
+            if slug: self.mark_dirty(slug)
+
+def notes_signature(path):
+    """Cheap fingerprint of a notes folder for the polling fallback: names, sizes and mtimes only."""
+    return frozenset((rel, tuple(sig)) for rel, sig in build_note_manifest(path).items())
+
+def watch_notes(vault_projects_dir, debounce=0.3, poll_interval=0.5, rescan_interval=30):
+    """Keeps 00_Notes and the vault in sync until Ctrl+C.
+
+    Uses watchdog filesystem notifications when installed, otherwise polls just
+    the notes/vault folders of each project. Bursts of saves are debounced and
+    only the projects that were touched get re-synced. The registry is refreshed
+    every `rescan_interval` seconds to pick up new projects and stop watching ones
+    that were archived, moved or deleted; a project whose folder has gone is never
+    synced again.
+    """
+    lock = threading.Lock()
+    dirty = {}
+    projects, owners, signatures = {}, {}, {}
+
+    def mark_dirty(slug):
+        with lock: dirty[slug] = time.monotonic()
+
+    def resolve(path):
+        current = os.path.normcase(os.path.abspath(path))
+        while True:
+            if current in owners: return owners[current]
+            parent = os.path.dirname(current)
+            if parent == current: return None
+            current = parent
+
+    observer = Observer() if Observer else None
+    watched = {}
+    handler = NotesChangeHandler(resolve, mark_dirty)
+
+    def forget(slug):
+        projects.pop(slug, None)
+        for folder in [f for f, owner in owners.items() if owner == slug]:
+            del owners[folder]
+            signatures.pop(folder, None)
+            watch = watched.pop(folder, None)
+            if watch:
+                try: observer.unschedule(watch)
+                except Exception: pass
+        with lock: dirty.pop(slug, None)
+
+    def refresh_projects():
+        current = {}
+        for project in iter_projects(): current.setdefault(project["slug"] or "Unknown", project)
+        for slug in [s for s in projects if s not in current or current[s]["root"] != projects[s]["root"]]: forget(slug)
+        for slug, project in current.items():
+            if slug in projects: continue
+            projects[slug] = project
+            notes_project = os.path.join(project["root"], "00_Notes")
+            notes_vault = os.path.join(vault_projects_dir, slug)
+            for folder in (notes_project, notes_vault):
+                os.makedirs(folder, exist_ok=True)
+                key = os.path.normcase(os.path.abspath(folder))
+                owners[key] = slug
+                if observer and key not in watched: watched[key] = observer.schedule(handler, folder, recursive=True)
+
+    refresh_projects()
+    if observer: observer.start()
+    else: signatures = {folder: notes_signature(folder) for folder in owners}
+
+    mode = "filesystem events" if observer else f"polling every {poll_interval}s"
+    console.print(f"[info]👀 Watching {len(projects)} projects ({mode}). Press Ctrl+C to stop.[/info]")
+
+    last_rescan = time.monotonic()
+    try:
+        while True:
+            time.sleep(0.1 if observer else poll_interval)
+            now = time.monotonic()
+
+            if not observer:
+                for folder, slug in owners.items():
+                    sig = notes_signature(folder)
+                    if sig != signatures.get(folder):
+                        signatures[folder] = sig
+                        mark_dirty(slug)
+
+            with lock:
+                ready = [slug for slug, stamp in dirty.items() if now - stamp >= debounce]
+                for slug in ready: del dirty[slug]
+
+            for slug in sorted(ready):
+                if slug not in projects: continue
+                if not os.path.isfile(os.path.join(projects[slug]["root"], ".project_meta.json")):
+                    # Archived, moved or deleted since the last rescan: stop watching it.
+                    forget(slug)
+                    continue
+                logs = sync_project_notes(projects[slug], vault_projects_dir)
+                stamp = datetime.datetime.now().strftime("%H:%M:%S")
+                for log in sorted(logs, key=lambda l: l["file"]):
+                    console.print(f"[dim]{stamp}[/dim] [cyan]{slug}[/cyan] {sync_log_symbol(log['type'])} {log['file']}")
+                if not observer:
+                    # Our own writes shouldn't trigger another round.
+                    for folder, owner in owners.items():
+                        if owner == slug: signatures[folder] = notes_signature(folder)
+
+            if now - last_rescan >= rescan_interval:
+                refresh_projects()
+                if not observer:
+                    for folder in owners: signatures.setdefault(folder, notes_signature(folder))
+                last_rescan = now
+    except KeyboardInterrupt:
+        console.print("\n[info]Stopped watching.[/info]")
+    finally:
+        if observer:
+            observer.stop()
+            observer.join()
+
+# --- ARCHIVE CATALOG ---
+
+def tree_size(root):
+    try: return sum(st.st_size for st in scan_tree(root)[0].values())
+    except OSError: return None
+
+def format_size(num_bytes):
+    if num_bytes is None: return "?"
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024: return f"{num_bytes:,.0f} {unit}" if unit == "B" else f"{num_bytes:,.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:,.1f} TB"
+
+def refresh_archive_catalog(conn):
+    """Brings the archive catalog up to date with ARCHIVE_PATH.
+
+    Archived projects are found at any depth (discovery stops at their
+    .project_meta.json). Hand-filed folders without meta within three levels of
+    the archive root are catalogued too, so they stay findable by name. Rows are
+    only rebuilt, and sizes only re-summed, when a folder's or meta file's mtime moved.
+    """
+    base = os.path.normpath(ARCHIVE_PATH)
+    cached_dirs = load_dir_cache(conn, base)
+    known = {row["path"]: row for row in conn.execute("SELECT * FROM archive")}
+    visited, seen = {}, set()
+
+    def upsert(path, kind, meta, size, dir_mtime, meta_mtime):
+        conn.execute(
+            "INSERT OR REPLACE INTO archive VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, kind, meta.get("name", os.path.basename(path)), meta.get("slug", os.path.basename(path)),
+             meta.get("client", "None"), meta.get("type", "Unknown"), size, dir_mtime, meta_mtime)
+        )
+
+    for root in discover_projects(base, dir_cache=cached_dirs, visited=visited):
+        try: meta_mtime = os.stat(os.path.join(root, ".project_meta.json")).st_mtime_ns
+        except OSError: continue
+        seen.add(root)
+        dir_mtime = visited[root][0]
+        row = known.get(root)
+        if row and row["kind"] == "project" and row["meta_mtime"] == meta_mtime and row["dir_mtime"] == dir_mtime: continue
+        upsert(root, "project", read_project_meta(root) or {}, tree_size(root), dir_mtime, meta_mtime)
+
+    base_depth = base.count(os.sep)
+    for path, (dir_mtime, is_project, _) in visited.items():
+        if is_project or path == base or path.count(os.sep) - base_depth > 3: continue
+        seen.add(path)
+        row = known.get(path)
+        if row and row["kind"] == "folder" and row["dir_mtime"] == dir_mtime: continue
+        upsert(path, "folder", {}, None, dir_mtime, None)
+
+    # Bundles are files, so they're looked for only in folders that were just re-listed.
+    rescanned = {path for path, entry in visited.items() if not entry[1] and cached_dirs.get(path) != entry}
+    for path in rescanned:
+        try:
+            with os.scandir(path) as it: bundles = [e for e in it if e.is_file() and e.name.lower().endswith(BUNDLE_SUFFIX)]
+        except OSError: continue
+        for e in bundles:
+            seen.add(e.path)
+            meta = read_bundle_meta(e.path) or {"name": e.name[:-len(BUNDLE_SUFFIX)], "slug": e.name[:-len(BUNDLE_SUFFIX)]}
+            st = e.stat()
+            upsert(e.path, "bundle", meta, st.st_size, st.st_mtime_ns, None)
+    for path, row in known.items():
+        if row["kind"] == "bundle" and os.path.dirname(path) in visited and os.path.dirname(path) not in rescanned: seen.add(path)
+
+    store_dir_cache(conn, cached_dirs, visited)
+    conn.executemany("DELETE FROM archive WHERE path = ?", [(p,) for p in known if p not in seen])
+    conn.commit()
+
+def reset_archive_catalog(conn):
+    base = os.path.normpath(ARCHIVE_PATH)
+    conn.execute("DELETE FROM archive")
+    conn.execute("DELETE FROM dirs WHERE path = ? OR substr(path, 1, ?) = ?", (base, len(base) + 1, base + os.sep))
+    conn.commit()
+
+def search_archive(conn, query, threshold=0.75):
+    """Token and fuzzy search over the catalog, best match first (exact substring hits score 2.0).
+
+    Every query token is looked for in the name, slug, client and folder name;
+    tokens that aren't substrings are scored with difflib against each word, so
+    typos and reordered words still match.
+    """
+    split = lambda text: [t for t in re.split(r"[\s_\-.]+", text.lower()) if t]
+    query_tokens = split(query)
+    if not query_tokens: return []
+
+    matches = []
+    for row in conn.execute("SELECT * FROM archive"):
+        haystack = " ".join(str(row[k] or "") for k in ("name", "slug", "client")) + " " + os.path.basename(row["path"])
+        haystack = haystack.lower()
+        if query.lower() in haystack: score = 2.0
+        else:
+            words = set(split(haystack))
+            scores = []
+            for token in query_tokens:
+                if token in haystack: scores.append(1.0)
+                else: scores.append(max((difflib.SequenceMatcher(None, token, w).ratio() for w in words), default=0.0))
+            score = sum(scores) / len(scores)
+        if score >= threshold: matches.append(dict(row, score=score))
+
+    matches.sort(key=lambda m: (-m["score"], m["kind"] != "project", m["name"].lower()))
+    return matches
+
+# --- BUNDLES ---
+
+def bundle_compression(rel):
+    """Already-compressed media is stored as-is; everything else gets compressed."""
+    if os.path.splitext(rel)[1].lower() in BUNDLE_STORED_EXTENSIONS: return zipfile.ZIP_STORED
+    return getattr(zipfile, "ZIP_ZSTANDARD", zipfile.ZIP_DEFLATED)
+
+def create_bundle(src, bundle_path):
+    """Packs a project folder into a seekable ZIP bundle and verifies it.
+
+    Each member is compressed on its own, so single files can be listed or
+    extracted later via the central directory without touching the rest. A
+    `.cos_bundle_index.json` member records the exact size and mtime of every
+    file (ZIP headers can't hold dates before 1980, so those are clamped there
+    and restored from the index). The bundle is written as `<bundle>.cos_partial`
+    and only renamed into place once every member's CRC has been checked; a
+    failed bundle is deleted. Returns the bundle size.
+    """
+    stats, dirs = scan_tree(src)
+    total_bytes = sum(st.st_size for st in stats.values())
+    staging = bundle_path + STAGING_SUFFIX
+    os.makedirs(os.path.dirname(bundle_path), exist_ok=True)
+
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            TimeRemainingColumn(),
+            console=console
+        ) as progress:
+            task = progress.add_task(f"[cyan]Bundling {len(stats)} files...", total=total_bytes)
+            with zipfile.ZipFile(staging, "w", allowZip64=True, strict_timestamps=False) as zf:
+                for rel in sorted(dirs): zf.writestr(manifest_key(rel) + "/", b"")
+                for rel in sorted(stats):
+                    zf.write(os.path.join(src, rel), manifest_key(rel), compress_type=bundle_compression(rel))
+                    progress.advance(task, stats[rel].st_size)
+                index = {manifest_key(rel): [st.st_size, st.st_mtime_ns] for rel, st in stats.items()}
+                zf.writestr(BUNDLE_INDEX_NAME, json.dumps(index), compress_type=zipfile.ZIP_DEFLATED)
+
+            progress.update(task, description="[cyan]Verifying bundle...", completed=0)
+            with zipfile.ZipFile(staging) as zf:
+                for info in zf.infolist():
+                    with zf.open(info) as f:  # reading to the end checks the member's CRC
+                        for chunk in iter(lambda: f.read(COPY_BUFFER), b""): progress.advance(task, len(chunk))
+    except BaseException:
+        # Never leave a half-written bundle in the archive.
+        try: os.remove(staging)
+        except OSError: pass
+        raise
+
+    os.replace(staging, bundle_path)
+    return os.path.getsize(bundle_path)
+
+def read_bundle_meta(bundle_path):
+    try:
+        with zipfile.ZipFile(bundle_path) as zf: return json.loads(zf.read(".project_meta.json").decode("utf-8-sig"))
+    except: return None
+
+def extract_bundle(bundle_path, dst, patterns=None):
+    """Restores members of a bundle into dst, with their original mtimes.
+
+    `patterns` (fnmatch, matched against the '/'-separated member path) limits
+    which files come out; only those members are decompressed. Returns the
+    list of extracted member names. Raises ValueError, before anything is
+    written, if a selected member would land outside dst (absolute or `..` names).
+    """
+    extracted = []
+    root = os.path.realpath(dst)
+    with zipfile.ZipFile(bundle_path) as zf:
+        try: index = json.loads(zf.read(BUNDLE_INDEX_NAME))
+        except KeyError: index = {}
+        members = []
+        for info in zf.infolist():
+            if info.filename == BUNDLE_INDEX_NAME: continue
+            if patterns and not any(fnmatch.fnmatch(info.filename, p) for p in patterns): continue
+            target = os.path.realpath(os.path.join(root, *info.filename.rstrip("/").split("/")))
+            if os.path.splitdrive(target)[0] != os.path.splitdrive(root)[0] or os.path.commonpath([root, target]) != root:
+                raise ValueError(f"Bundle member {info.filename!r} points outside {dst}; nothing was extracted.")
+            members.append((info, target))
+        for info, target in members:
+            if info.is_dir():
+                os.makedirs(target, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with zf.open(info) as fsrc, open(target, "wb") as fdst: shutil.copyfileobj(fsrc, fdst, COPY_BUFFER)
+            if info.filename in index: os.utime(target, ns=(index[info.filename][1], index[info.filename][1]))
+            extracted.append(info.filename)
+    return extracted
+
+def list_bundle(bundle_path):
+    table = Table(title=os.path.basename(bundle_path), box=box.SIMPLE)
+    table.add_column("File", style="white")
+    table.add_column("Size", style="cyan", justify="right")
+    table.add_column("Stored", style="dim", justify="right")
+    with zipfile.ZipFile(bundle_path) as zf:
+        for info in zf.infolist():
+            if info.is_dir() or info.filename == BUNDLE_INDEX_NAME: continue
+            table.add_row(info.filename, format_size(info.file_size), format_size(info.compress_size))
+    console.print(table)
+
+# --- COPY ENGINE ---
+
+def scan_tree(root):
+    """Lists a tree once with scandir: returns ({relpath: stat}, [relative dirs])."""
+    files, dirs = {}, []
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        with os.scandir(os.path.join(root, rel) if rel else root) as it:
+            for e in it:
+                rel_name = os.path.join(rel, e.name) if rel else e.name
+                if e.is_dir(follow_symlinks=False):
+                    dirs.append(rel_name)
+                    stack.append(rel_name)
+                elif e.is_file(): files[rel_name] = e.stat()
+    return files, dirs
+
+def kernel_copy(fsrc, fdst, size, on_bytes):
+    """Lets the OS move the bytes (copy_file_range, then sendfile). Returns how far it got."""
+    infd, outfd = fsrc.fileno(), fdst.fileno()
+    for name in ("copy_file_range", "sendfile"):
+        if not hasattr(os, name): continue
+        offset = 0
+        try:
+            while offset < size:
+                count = min(COPY_BUFFER, size - offset)
+                if name == "copy_file_range": n = os.copy_file_range(infd, outfd, count, offset, offset)
+                else: n = os.sendfile(outfd, infd, offset, count)
+                if n == 0: break
+                offset += n
+                on_bytes(n)
+            return offset
+        except OSError:
+            # Unsupported for this pair of filesystems; finish with the next method.
+            if offset: return offset
+    return 0
+
+def new_verify_hasher():
+    """xxh3-128 when the optional xxhash package is installed, BLAKE2b otherwise."""
+    if xxhash: return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+def copy_file_fast(src, dst, on_bytes=lambda n: None, verify=False, resume=False):
+    """Copies one file plus its timestamps, reporting progress in bytes as it goes.
+
+    With `verify`, the source is hashed from the same buffers that are written
+    (so it is only read once), the destination is flushed to disk and read
+    back, and a mismatch raises OSError. Returns the seconds spent hashing.
+
+    With `resume`, the bytes go to `<dst>.cos_partial`, which is renamed over
+    dst once complete. If an interrupted copy left that file behind, copying
+    continues from its size instead of byte 0, and the result is always
+    verified; on a mismatch the partial file is dropped and the copy restarts.
+    """
+    part = dst + STAGING_SUFFIX if resume else dst
+    offset = 0
+    if resume:
+        try: offset = os.path.getsize(part)
+        except OSError: pass
+        if offset > os.path.getsize(src): offset = 0
+    check_all = verify or offset > 0
+    hasher = new_verify_hasher() if check_all else None
+    hash_seconds = 0.0
+    with open(src, "rb") as fsrc, open(part, "r+b" if offset else "wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        buf = memoryview(bytearray(COPY_BUFFER))
+        if offset:
+            # The resumed prefix isn't rewritten, but it still has to be in the source hash.
+            t = time.perf_counter()
+            remaining = offset
+            while remaining:
+                n = fsrc.readinto(buf[:min(COPY_BUFFER, remaining)])
+                if not n: break
+                hasher.update(buf[:n])
+                remaining -= n
+            hash_seconds += time.perf_counter() - t
+            on_bytes(offset)
+        # Kernel copies never surface the bytes, so verified copies always take the buffered path.
+        done = offset if check_all else kernel_copy(fsrc, fdst, size, on_bytes)
+        if done < size:
+            fsrc.seek(done)
+            fdst.seek(done)
+            while True:
+                n = fsrc.readinto(buf)
+                if not n: break
+                fdst.write(buf[:n])
+                if hasher:
+                    t = time.perf_counter()
+                    hasher.update(buf[:n])
+                    hash_seconds += time.perf_counter() - t
+                on_bytes(n)
+        if offset: fdst.truncate()
+        if check_all:
+            fdst.flush()
+            os.fsync(fdst.fileno())
+    shutil.copystat(src, part)
+
+    if check_all:
+        t = time.perf_counter()
+        check = new_verify_hasher()
+        with open(part, "rb") as f:
+            for chunk in iter(lambda: f.read(COPY_BUFFER), b""): check.update(chunk)
+        hash_seconds += time.perf_counter() - t
+        if check.digest() != hasher.digest():
+            if offset:
+                # The partial file didn't match the source (it changed since): start over.
+                os.remove(part)
+                return hash_seconds + copy_file_fast(src, dst, verify=verify, resume=resume)
+            raise OSError(f"Checksum mismatch after copy: {dst}")
+    if resume: os.replace(part, dst)
+    return hash_seconds
+
+def copy_with_progress(src, dst, files=None, jobs=None, verify=False, done=None):
+    """Copies the tree at src into dst with a byte-based progress bar.
+
+    Small files go to a thread pool so per-file overhead overlaps; files of
+    COPY_LARGE_FILE or more are streamed one at a time with a big buffer (or the
+    kernel's copy_file_range/sendfile), which suits spinning and USB disks.
+    `files` limits the copy to those relative paths; `verify` checksums every
+    file (see copy_file_fast). Large files are copied resumably, so a copy cut
+    off partway through one picks up where it stopped next time. Each file that finishes is added to the `done`
+    set as it completes, so callers still know what made it if the copy is
+    interrupted.
+
+    A failing file doesn't stop the rest. Returns a summary dict with "files",
+    "bytes", "seconds", "hash_seconds" and "failed" (a list of (relpath, error)).
+    """
+    jobs = jobs or COPY_JOBS
     os.makedirs(dst, exist_ok=True)
-    
-    all_files = []
-    for root, _, files in os.walk(src):
-        for name in files:
-            all_files.append(os.path.join(root, name))
+
+    stats, dirs = scan_tree(src)
+    if files is not None: stats = {rel: stats[rel] for rel in files if rel in stats}
+    else:
+        for rel in dirs: os.makedirs(os.path.join(dst, rel), exist_ok=True)
+    for parent in {os.path.dirname(rel) for rel in stats}:
+        if parent: os.makedirs(os.path.join(dst, parent), exist_ok=True)
+
+    total_bytes = sum(st.st_size for st in stats.values())
+    large = sorted(rel for rel, st in stats.items() if st.st_size >= COPY_LARGE_FILE)
+    small = sorted(rel for rel, st in stats.items() if st.st_size < COPY_LARGE_FILE)
+    failed, hash_seconds = [], 0.0
+    started = time.perf_counter()
 
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
-        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        DownloadColumn(),
+        TransferSpeedColumn(),
         TimeRemainingColumn(),
         console=console
     ) as progress:
-        task = progress.add_task(f"[cyan]Copying {len(all_files)} files...", total=len(all_files))
-        
-        for f in all_files:
-            rel_path = os.path.relpath(f, src)
-            dest_file_path = os.path.join(dst, rel_path)
-            
-            os.makedirs(os.path.dirname(dest_file_path), exist_ok=True)
-            shutil.copy2(f, dest_file_path)
-            progress.advance(task)
+        label = "Copying + verifying" if verify else "Copying"
+        task = progress.add_task(f"[cyan]{label} {len(stats)} files...", total=total_bytes)
+        advance = lambda n: progress.advance(task, n)
+        def copy_one(rel, resume=False):
+            seconds = copy_file_fast(os.path.join(src, rel), os.path.join(dst, rel), advance, verify, resume)
+            if done is not None: done.add(rel)
+            return seconds
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(copy_one, rel): rel for rel in small}
+            for rel in large:
+                try: hash_seconds += copy_one(rel, resume=True)
+                except Exception as e: failed.append((rel, str(e)))
+            for future, rel in futures.items():
+                try: hash_seconds += future.result()
+                except Exception as e: failed.append((rel, str(e)))
+
+    elapsed = time.perf_counter() - started
+    mb = total_bytes / (1024 * 1024)
+    console.print(f"   [dim]{len(stats)} files, {mb:,.1f} MB in {elapsed:.1f}s ({mb / max(elapsed, 0.001):,.1f} MB/s)[/dim]")
+    if verify:
+        algo = "xxh3" if xxhash else "BLAKE2b"
+        # Every byte is hashed twice: once on the way in, once on read-back.
+        console.print(f"   [dim]Verified with {algo}: {2 * mb:,.1f} MB hashed in {hash_seconds:.1f}s ({2 * mb / max(hash_seconds, 0.001):,.1f} MB/s)[/dim]")
+    for rel, error in sorted(failed):
+        console.print(f"   [error]❌ {rel}: {error}[/error]")
+    return {"files": len(stats), "bytes": total_bytes, "seconds": elapsed, "hash_seconds": hash_seconds, "failed": sorted(failed)}
+
+# --- THUMBNAIL MIRROR ---
+
+def load_thumb_index(gallery_root):
+    """Reads the mirror index: source path -> {size, mtime_ns, hash, name}."""
+    try:
+        with open(os.path.join(gallery_root, THUMB_INDEX_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except: return {"sources": {}}
+
+def save_thumb_index(gallery_root, index):
+    path = os.path.join(gallery_root, THUMB_INDEX_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f: json.dump(index, f)
+    os.replace(path + ".tmp", path)
+
+def thumb_blob_path(gallery_root, digest, ext):
+    return os.path.join(gallery_root, THUMB_STORE_NAME, digest[:2], digest + ext.lower())
+
+def store_thumb_blob(gallery_root, src):
+    """Hashes `src` and copies it into the store unless that content is already there.
+
+    Returns (hash, blob path, True if the blob was newly written).
+    """
+    digest = hash_file(src)
+    blob = thumb_blob_path(gallery_root, digest, os.path.splitext(src)[1])
+    if os.path.exists(blob): return digest, blob, False
+    os.makedirs(os.path.dirname(blob), exist_ok=True)
+    # Workers may store the same content at once; each writes its own temp file and the last rename wins.
+    tmp = f"{blob}.{threading.get_ident()}.tmp"
+    copy_file_fast(src, tmp)
+    os.replace(tmp, blob)
+    return digest, blob, True
+
+def link_thumb(blob, dst):
+    """Points a gallery name at a blob: a hardlink, or a copy (reflinked by copy_file_range
+    on CoW filesystems) where the volume can't hardlink. Replaces whatever was there."""
+    try:
+        if os.path.exists(dst) and os.path.samefile(blob, dst): return False
+    except OSError: pass
+    tmp = f"{dst}.{threading.get_ident()}.tmp"
+    if os.path.lexists(tmp): os.remove(tmp)
+    try: os.link(blob, tmp)
+    except OSError: copy_file_fast(blob, tmp)
+    os.replace(tmp, dst)
+    return True
+
+def prune_thumb_store(gallery_root, referenced):
+    """Deletes blobs no index entry points at any more."""
+    removed = 0
+    store = os.path.join(gallery_root, THUMB_STORE_NAME)
+    if not os.path.isdir(store): return 0
+    for rel in scan_tree(store)[0]:
+        if os.path.basename(rel).split(".")[0] in referenced: continue
+        try:
+            os.remove(os.path.join(store, rel))
+            removed += 1
+        except OSError: pass
+    return removed
+
+def remove_thumb_name(gallery_root, sources, src, name):
+    """Drops a gallery name unless another indexed source still uses it."""
+    if any(entry["name"] == name for other, entry in sources.items() if other != src): return 0
+    try:
+        os.remove(os.path.join(gallery_root, name))
+        return 1
+    except OSError: return 0
+
+def mirror_one_thumb(gallery_root, src, dst_file):
+    """Worker: stores one source image and links its gallery name. Returns (hash, stored, linked)."""
+    digest, blob, stored = store_thumb_blob(gallery_root, src)
+    return digest, stored, link_thumb(blob, dst_file)
+
+def mirror_thumbnails(gallery_root, projects, full=False, jobs=None):
+    """Brings the content-addressed gallery up to date with every project's 02_Assets/Thumbnails.
+
+    Each distinct image is stored once under .store/<ab>/<hash>.<ext>; the
+    dated gallery names are hardlinks to those blobs. A thumbnail folder whose
+    mtime matches the index is skipped without being listed (`full` lists them
+    all anyway), and a source is only hashed when its size or mtime differs from
+    the index. The images that need work are hashed and linked by `jobs`
+    threads behind a single progress bar. When an image is renamed, re-dated,
+    replaced or deleted inside a project, its old gallery name is removed;
+    thumbnails of projects that are no longer scanned (archived) are kept.
+    Returns a summary dict with "new", "stored", "removed", "pruned", "skipped",
+    "files", "bytes", "seconds" and "failed" ([(source, error)]).
+    """
+    index = load_thumb_index(gallery_root)
+    sources = index.setdefault("sources", {})
+    folders = index.setdefault("folders", {})
+    stats = {"new": 0, "stored": 0, "removed": 0, "pruned": 0, "skipped": 0, "files": 0, "bytes": 0, "seconds": 0.0, "failed": []}
+    scanned, seen, work, old_names = set(), set(), [], []
+    dirty = False
+
+    for project in projects:
+        thumb_source = os.path.join(project["root"], "02_Assets", "Thumbnails")
+        try: dir_mtime = os.stat(thumb_source).st_mtime_ns
+        except OSError:
+            # The project is live but its thumbnail folder is gone: everything mirrored from it goes too.
+            scanned.add(thumb_source)
+            dirty |= folders.pop(thumb_source, None) is not None
+            continue
+        if not full and folders.get(thumb_source) == dir_mtime:
+            stats["skipped"] += 1
+            continue
+        try:
+            with os.scandir(thumb_source) as it: images = [e for e in it if e.is_file() and e.name.lower().endswith(THUMB_EXTENSIONS)]
+        except OSError: continue
+        scanned.add(thumb_source)
+        folders[thumb_source] = dir_mtime
+        dirty = True
+        project_name = project["slug"] or os.path.basename(project["root"])
+
+        for e in images:
+            st = e.stat()
+            seen.add(e.path)
+            date_str = datetime.datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d")
+            new_name = f"{date_str}_{project_name}_{e.name}"
+            entry = sources.get(e.path)
+            if (entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns
+                    and entry["name"] == new_name and os.path.exists(os.path.join(gallery_root, new_name))): continue
+            work.append((e.path, st, new_name, project.get("client") or "None"))
+
+    if work:
+        start = time.perf_counter()
+        with Progress(SpinnerColumn(), TextColumn("{task.description}"), BarColumn(), TextColumn("{task.fields[files]}/%d" % len(work)),
+                      DownloadColumn(), TransferSpeedColumn(), console=console) as progress:
+            task = progress.add_task("Mirroring", total=sum(st.st_size for _, st, _, _ in work), files=0)
+            with ThreadPoolExecutor(max_workers=jobs or COPY_JOBS) as pool:
+                futures = {pool.submit(mirror_one_thumb, gallery_root, src, os.path.join(gallery_root, name)): (src, st, name, client)
+                           for src, st, name, client in work}
+                for future in as_completed(futures):
+                    src, st, new_name, client = futures[future]
+                    stats["files"] += 1
+                    progress.update(task, advance=st.st_size, files=stats["files"])
+                    try: digest, stored, linked = future.result()
+                    except OSError as e:
+                        stats["failed"].append((src, e))
+                        # Leave the folder marked as changed so the next run retries it.
+                        folders.pop(os.path.dirname(src), None)
+                        continue
+                    stats["bytes"] += st.st_size
+                    stats["stored"] += stored
+                    stats["new"] += linked
+                    entry = sources.get(src)
+                    if entry and entry["name"] != new_name: old_names.append((src, entry["name"]))
+                    sources[src] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": digest, "name": new_name, "client": client}
+        stats["seconds"] = time.perf_counter() - start
+
+    # Old names are only dropped once every new one is linked, in case another image took the name over.
+    for src, name in old_names: stats["removed"] += remove_thumb_name(gallery_root, sources, src, name)
+    for src in [s for s in sources if s not in seen and os.path.dirname(s) in scanned]:
+        entry = sources.pop(src)
+        stats["removed"] += remove_thumb_name(gallery_root, sources, src, entry["name"])
+
+    if not dirty: return stats
+    if stats["new"] or stats["removed"]:
+        stats["pruned"] = prune_thumb_store(gallery_root, {entry["hash"] for entry in sources.values()})
+    save_thumb_index(gallery_root, index)
+    return stats
+
+# --- GALLERY PREVIEWS ---
+
+def preview_format():
+    """WebP when this Pillow build can write it, JPEG otherwise."""
+    return ("WEBP", ".webp") if pil_features.check("webp") else ("JPEG", ".jpg")
+
+def render_preview(src, dst, size, fmt):
+    """Process-pool worker: writes a `size`-bounded preview of one image."""
+    with Image.open(src) as im:
+        im.draft("RGB", (size, size))
+        im = ImageOps.exif_transpose(im)
+        im.thumbnail((size, size))
+        if fmt == "JPEG" and im.mode != "RGB": im = im.convert("RGB")
+        im.save(dst + ".tmp", fmt, quality=80)
+    os.replace(dst + ".tmp", dst)
+    return dst
+
+def build_previews(gallery_root, sources, jobs=None):
+    """Renders one preview per distinct source hash, skipping hashes that already have one.
+
+    Previews are named after the content hash, so an image is only re-rendered
+    when its content changes. Previews nothing refers to any more are deleted.
+    Returns (rendered, failed, {hash: preview path relative to the gallery}).
+    """
+    fmt, ext = preview_format()
+    preview_dir = os.path.join(gallery_root, PREVIEW_DIR_NAME)
+    os.makedirs(preview_dir, exist_ok=True)
+    blobs = {}
+    for entry in sources.values():
+        blobs[entry["hash"]] = thumb_blob_path(gallery_root, entry["hash"], os.path.splitext(entry["name"])[1])
+    with os.scandir(preview_dir) as it: existing = {e.name for e in it if e.is_file()}
+
+    todo = {h: blob for h, blob in blobs.items() if h + ext not in existing}
+    rendered, failed = 0, []
+    if todo:
+        with Progress(SpinnerColumn(), TextColumn("{task.description}"), BarColumn(), TextColumn("{task.completed}/{task.total}"), console=console) as progress:
+            task = progress.add_task("Rendering previews", total=len(todo))
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = {pool.submit(render_preview, blob, os.path.join(preview_dir, h + ext), PREVIEW_SIZE, fmt): blob for h, blob in todo.items()}
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                        rendered += 1
+                    except Exception as e: failed.append((futures[future], e))
+                    progress.advance(task)
+
+    for name in existing:
+        if name.split(".")[0] not in blobs:
+            try: os.remove(os.path.join(preview_dir, name))
+            except OSError: pass
+    failed_blobs = {blob for blob, _ in failed}
+    previews = {h: f"{PREVIEW_DIR_NAME}/{h}{ext}" for h, blob in blobs.items() if blob not in failed_blobs}
+    return rendered, failed, previews
+
+def write_contact_sheets(gallery_root, sources, previews):
+    """Writes paginated Markdown contact sheets grouped by month, then client.
+
+    Newest month first. Each preview links to its full-size gallery file;
+    images without a preview (unreadable ones) are listed as plain links.
+    Returns the number of pages written.
+    """
+    clients = {p["root"]: p["client"] for p in registry_projects()}
+    groups = {}
+    for src, entry in sources.items():
+        root = os.path.dirname(os.path.dirname(os.path.dirname(src)))
+        client = clients.get(root) or entry.get("client") or "None"
+        groups.setdefault((entry["name"][:7], client), []).append(entry)
+
+    items = []
+    for month, client in sorted(groups, key=lambda k: (k[0], k[1].lower() != "none", k[1].lower()), reverse=True):
+        for entry in sorted(groups[(month, client)], key=lambda e: e["name"], reverse=True): items.append((month, client, entry))
+    pages = [items[i:i + PREVIEWS_PER_PAGE] for i in range(0, len(items), PREVIEWS_PER_PAGE)] or [[]]
+    page_name = lambda n: f"{CONTACT_SHEET_NAME}.md" if n == 1 else f"{CONTACT_SHEET_NAME}_{n:02d}.md"
+
+    for n, page in enumerate(pages, 1):
+        nav = []
+        if n > 1: nav.append(f"[← Newer](<{page_name(n - 1)}>)")
+        nav.append(f"Page {n} of {len(pages)}")
+        if n < len(pages): nav.append(f"[Older →](<{page_name(n + 1)}>)")
+        nav = " · ".join(nav)
+
+        lines = ["# Thumbnail Contact Sheet", "", nav, ""]
+        current_month = current_client = None
+        for month, client, entry in page:
+            if month != current_month:
+                lines += ["", f"## {month}"]
+                current_month, current_client = month, None
+            if client != current_client:
+                lines += ["", f"### {client}", ""]
+                current_client = client
+            preview = previews.get(entry["hash"])
+            if preview: lines.append(f"[![{entry['name']}](<{preview}>)](<{entry['name']}>)")
+            else: lines.append(f"[{entry['name']}](<{entry['name']}>)")
+        lines += ["", nav, ""]
+        path = os.path.join(gallery_root, page_name(n))
+        with open(path + ".tmp", "w", encoding="utf-8") as f: f.write("\n".join(lines))
+        os.replace(path + ".tmp", path)
+
+    # Drop pages left over from a bigger gallery.
+    n = len(pages) + 1
+    while os.path.exists(os.path.join(gallery_root, page_name(n))):
+        os.remove(os.path.join(gallery_root, page_name(n)))
+        n += 1
+    return len(pages)
+
+# --- DOWNLOADS CLEANUP ---
+
+def parse_size(value):
+    """Accepts a byte count or a string such as "500KB", "1.5 GB"."""
+    if isinstance(value, (int, float)): return int(value)
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)B?\s*", str(value), re.IGNORECASE)
+    if not match: raise ValueError(f"Bad size: {value!r}")
+    return int(float(match.group(1)) * 1024 ** " KMGT".index(match.group(2).upper() or " "))
+
+def compile_clean_rules(rules):
+    """Turns the `clean_rules` config entries into ready-to-test dicts, warning about broken ones.
+
+    A rule sends matching files to "folder" (null leaves them where they are)
+    and may test "glob" (a pattern or list, case-insensitive), "min_size" /
+    "max_size" and "older_than_days" / "newer_than_days" (by modification time).
+    """
+    compiled = []
+    now = time.time()
+    for rule in rules:
+        try:
+            globs = rule.get("glob", [])
+            if isinstance(globs, str): globs = [globs]
+            compiled.append({
+                "folder": rule["folder"],
+                "globs": [re.compile(fnmatch.translate(g.lower())) for g in globs],
+                "min_size": parse_size(rule["min_size"]) if "min_size" in rule else None,
+                "max_size": parse_size(rule["max_size"]) if "max_size" in rule else None,
+                "before": now - float(rule["older_than_days"]) * 86400 if "older_than_days" in rule else None,
+                "after": now - float(rule["newer_than_days"]) * 86400 if "newer_than_days" in rule else None,
+            })
+        except KeyError as e:
+            console.print(f"[warning]⚠️  Ignoring clean rule {rule}: missing {e}[/warning]")
+        except (TypeError, ValueError) as e:
+            console.print(f"[warning]⚠️  Ignoring clean rule {rule}: {e}[/warning]")
+    for rule in compiled: rule["needs_stat"] = any(rule[k] is not None for k in ("min_size", "max_size", "before", "after"))
+    return compiled
+
+def clean_rule_matches(rule, entry):
+    name = entry.name.lower()
+    if rule["globs"] and not any(g.match(name) for g in rule["globs"]): return False
+    if not rule["needs_stat"]: return True
+    st = entry.stat()
+    if rule["min_size"] is not None and st.st_size < rule["min_size"]: return False
+    if rule["max_size"] is not None and st.st_size > rule["max_size"]: return False
+    if rule["before"] is not None and st.st_mtime > rule["before"]: return False
+    if rule["after"] is not None and st.st_mtime < rule["after"]: return False
+    return True
+
+def sniff_header(head):
+    """Maps the first bytes of a file to a cleanup folder by magic number, or None."""
+    if head[:4] == b"RIFF": return SNIFF_RIFF_TYPES.get(head[8:12])
+    if head[4:8] == b"ftyp":
+        brand = head[8:12]
+        if brand.startswith(SNIFF_FTYP_AUDIO): return "_Audio"
+        if brand in SNIFF_FTYP_IMAGES: return "_Images"
+        return "_Video"
+    if head[:4] == b"PK\x03\x04":
+        # Office documents are ZIPs too; their first entries name the part folders.
+        if any(part in head for part in (b"word/", b"xl/", b"ppt/")): return "_Docs"
+        return "_Archives"
+    if head[:1] == b"\x47" and len(head) > 188 and head[188:189] == b"\x47": return "_Video"
+    for offset, magic, folder in SNIFF_SIGNATURES:
+        if head[offset:offset + len(magic)] == magic: return folder
+    lowered = head[:1024].lstrip().lower()
+    if lowered.startswith((b"<svg", b"<?xml")) and b"<svg" in lowered: return "_Images"
+    return None
+
+def sniff_download(conn, entry):
+    """Classifies a file by its first SNIFF_BYTES, caching the answer by (size, mtime_ns, inode)
+    so files that are left behind or renamed are never read twice."""
+    st = entry.stat()
+    key = (st.st_size, st.st_mtime_ns, entry.inode())
+    row = conn.execute("SELECT folder FROM sniff WHERE size = ? AND mtime_ns = ? AND inode = ?", key).fetchone()
+    if row: return row["folder"]
+    try:
+        with open(entry.path, "rb") as f: folder = sniff_header(f.read(SNIFF_BYTES))
+    except OSError: return None
+    conn.execute("INSERT OR REPLACE INTO sniff VALUES (?, ?, ?, ?)", key + (folder,))
+    return folder
+
+def classify_download(entry, rules, conn=None):
+    """Returns the folder a file belongs in, or None to leave it.
+
+    Rules first, then the extension table. With a registry connection, files
+    the table doesn't know (including extensionless ones) are content-sniffed
+    before falling back to _Other.
+    """
+    for rule in rules:
+        if clean_rule_matches(rule, entry): return rule["folder"]
+    folder = CLEAN_EXTENSIONS.get(os.path.splitext(entry.name)[1].lower())
+    if folder: return folder
+    if conn is not None: folder = sniff_download(conn, entry)
+    return folder or CLEAN_FALLBACK_FOLDER
+
+def plan_clean(target_path, rules, conn=None):
+    """Lists `target_path` once and groups its loose files by destination folder: {folder: [names]}."""
+    batches = {}
+    with os.scandir(target_path) as it:
+        for entry in it:
+            if entry.name.startswith(".") or not entry.is_file(): continue
+            folder = classify_download(entry, rules, conn)
+            if folder: batches.setdefault(folder, []).append(entry.name)
+    return batches
+
+def apply_clean(target_path, batches):
+    """Moves each batch into its folder; every folder is created and listed once.
+
+    Files whose name is already taken in the destination are left in place.
+    Returns ({folder: moved count}, [(name, reason)]).
+    """
+    moved, problems = {}, []
+    for folder, names in batches.items():
+        dest_dir = os.path.join(target_path, folder)
+        try:
+            os.makedirs(dest_dir, exist_ok=True)
+            with os.scandir(dest_dir) as it: taken = {e.name.lower() for e in it}
+        except OSError as e:
+            problems += [(name, str(e)) for name in names]
+            continue
+        for name in names:
+            if name.lower() in taken:
+                problems.append((name, f"already exists in {folder}"))
+                continue
+            try: os.rename(os.path.join(target_path, name), os.path.join(dest_dir, name))
+            except OSError as e:
+                problems.append((name, str(e)))
+                continue
+            taken.add(name.lower())
+            moved[folder] = moved.get(folder, 0) + 1
+    return moved, problems
+
+# --- DEDUPE ---
+
+def default_dedupe_targets():
+    """The folders `clean` and `sort-exports` fill up: Downloads/_Video, Downloads/_Images and every export year."""
+    targets = [os.path.join(DOWNLOADS_PATH, "_Video"), os.path.join(DOWNLOADS_PATH, "_Images")]
+    try:
+        with os.scandir(EXPORTS_PATH) as it: targets += sorted(e.path for e in it if e.is_dir() and re.fullmatch(r"\d{4}", e.name))
+    except OSError: pass
+    return [t for t in targets if os.path.isdir(t)]
+
+def collect_dedupe_files(targets):
+    """Returns [(path, stat)] for every non-empty file under the targets, skipping _Duplicates
+    folders and counting hardlinks to one file only once.
+
+    Directory-listing stats carry no inode number on Windows, so files that share
+    their size with another file are stat'ed again for the hardlink check.
+    """
+    by_size = {}
+    for target in targets:
+        for rel, st in scan_tree(target)[0].items():
+            if rel.split(os.sep)[0] == DEDUPE_TRASH_NAME or st.st_size == 0: continue
+            by_size.setdefault(st.st_size, []).append((os.path.join(target, rel), st))
+    files, inodes = [], set()
+    for group in by_size.values():
+        if len(group) == 1:
+            files.extend(group)
+            continue
+        for path, st in group:
+            try: st = os.stat(path)
+            except OSError: continue
+            if st.st_ino and (st.st_dev, st.st_ino) in inodes: continue
+            inodes.add((st.st_dev, st.st_ino))
+            files.append((path, st))
+    return files
+
+def partial_hash(path, size):
+    """Hashes the first and last DEDUPE_PARTIAL_BYTES; for small files this covers the whole file."""
+    h = new_verify_hasher()
+    with open(path, "rb") as f:
+        h.update(f.read(DEDUPE_PARTIAL_BYTES))
+        if size > 2 * DEDUPE_PARTIAL_BYTES: f.seek(-DEDUPE_PARTIAL_BYTES, os.SEEK_END)
+        h.update(f.read(DEDUPE_PARTIAL_BYTES))
+    return h.hexdigest()
+
+def full_hash(path):
+    h = new_verify_hasher()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(COPY_BUFFER), b""): h.update(chunk)
+    return h.hexdigest()
+
+def refine_groups(groups, key_fn, jobs):
+    """Splits each candidate group by key_fn(path, stat), run in a thread pool; drops singletons."""
+    refined = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for group in groups:
+            buckets = {}
+            for item, key in zip(group, pool.map(lambda item: key_fn(*item), group)):
+                if key is not None: buckets.setdefault(key, []).append(item)
+            refined += [g for g in buckets.values() if len(g) > 1]
+    return refined
+
+def keeper_order(item):
+    """The copy to keep sorts first: no _vN suffix, then the oldest, then the shortest path."""
+    path, st = item
+    return (bool(VERSION_SUFFIX.search(os.path.splitext(os.path.basename(path))[0])), st.st_mtime, len(path), path)
+
+def find_duplicates(files, jobs=None):
+    """Staged duplicate search: same size, then same head/tail hash, then same full hash.
+
+    Each stage only reads files that are still in a group with another file;
+    files small enough for the partial hash to cover them skip the full pass.
+    Returns groups of (path, stat), the copy to keep first.
+    """
+    by_size = {}
+    for path, st in files: by_size.setdefault(st.st_size, []).append((path, st))
+    groups = [g for g in by_size.values() if len(g) > 1]
+
+    def safe(fn):
+        def run(path, st):
+            try: return fn(path, st)
+            except OSError: return None
+        return run
+
+    groups = refine_groups(groups, safe(lambda path, st: partial_hash(path, st.st_size)), jobs or COPY_JOBS)
+    small = [g for g in groups if g[0][1].st_size <= 2 * DEDUPE_PARTIAL_BYTES]
+    large = [g for g in groups if g[0][1].st_size > 2 * DEDUPE_PARTIAL_BYTES]
+    groups = small + refine_groups(large, safe(lambda path, st: full_hash(path)), jobs or COPY_JOBS)
+    return [sorted(g, key=keeper_order) for g in groups]
+
+def dedupe_target_of(path, targets):
+    return next(t for t in targets if os.path.normcase(path).startswith(os.path.normcase(os.path.join(t, ""))))
+
+def collapse_duplicate(keeper, dup, mode, targets):
+    """Replaces `dup` with a hardlink to `keeper` ("link") or moves it into the _Duplicates
+    folder of the target it lives in ("trash")."""
+    if mode == "link":
+        tmp = dup + ".cos_link.tmp"
+        os.link(keeper, tmp)
+        try: os.replace(tmp, dup)
+        except OSError:
+            os.remove(tmp)
+            raise
+        return dup
+    target = dedupe_target_of(dup, targets)
+    dest = os.path.join(target, DEDUPE_TRASH_NAME, os.path.relpath(dup, target))
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    base, ext = os.path.splitext(dest)
+    counter = 2
+    while os.path.exists(dest):
+        dest = f"{base}_{counter}{ext}"
+        counter += 1
+    os.rename(dup, dest)
+    return dest
+
+# --- TRAVEL MANIFEST ---
+
+def manifest_key(rel):
+    return rel.replace(os.sep, "/")
+
+def is_travel_artifact(rel):
+    return manifest_key(rel) in (TRAVEL_LOG_NAME, TRAVEL_MANIFEST_NAME, RETURN_REPORT_NAME) or rel.endswith(STAGING_SUFFIX)
+
+def load_travel_manifest(dest_path):
+    """Reads the shuttle-side manifest: relpath -> {size, mtime_ns, dst_mtime_ns, hash}."""
+    try:
+        with open(os.path.join(dest_path, TRAVEL_MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except: return {}
+
+def save_travel_manifest(dest_path, files):
+    os.makedirs(dest_path, exist_ok=True)
+    path = os.path.join(dest_path, TRAVEL_MANIFEST_NAME)
+    data = {"updated": datetime.datetime.now().isoformat(timespec="seconds"), "files": files}
+    with open(path + ".tmp", "w", encoding="utf-8") as f: json.dump(data, f)
+    os.replace(path + ".tmp", path)
+
+def plan_travel_delta(src_root, dst_root, src_stats, dst_stats, manifest, checksum=False):
+    """Returns the source relpaths that need copying, rsync-style.
+
+    A file is skipped when the manifest still matches its size and mtime and the
+    shuttle copy is present at that size. With `checksum`, unchanged-looking
+    files are also hashed and compared against the manifest hash (which is
+    filled in on the entry when it matches).
+    """
+    changed = []
+    for rel, st in sorted(src_stats.items()):
+        entry = manifest.get(manifest_key(rel))
+        dst = dst_stats.get(rel)
+        if not entry or not dst or dst.st_size != st.st_size:
+            changed.append(rel)
+        elif entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+            changed.append(rel)
+        elif checksum:
+            digest = hash_file(os.path.join(src_root, rel))
+            # Trips made without --checksum have no hash yet; hash the shuttle copy once instead of recopying.
+            expected = entry.get("hash") or hash_file(os.path.join(dst_root, rel))
+            if digest != expected: changed.append(rel)
+            else: entry["hash"] = digest
+    return changed
 
 def setup_git(project_path, category):
     """Initializes Git and adds .gitignore."""
@@ -319,6 +1742,7 @@ tags: [creativeos]
         }
         with open(os.path.join(target_dir, ".project_meta.json"), "w") as f:
             json.dump(meta, f, indent=4)
+        registry_add(target_dir, meta)
     
     # Git Setup (outside spinner context so prompts are visible)
     if args.git:
@@ -396,6 +1820,7 @@ tags: [creativeos]
     }
     with open(os.path.join(cwd, ".project_meta.json"), "w") as f:
         json.dump(meta, f, indent=4)
+    registry_add(cwd, meta)
         
     console.print(Panel(f"Project adopted! Slug: [bold]{slug}[/bold]", style="success"))
 
@@ -422,31 +1847,33 @@ def cmd_sync(args):
     changes_table.add_column("Action", style="white")
     changes_table.add_column("File", style="dim")
 
+    jobs = max(1, args.jobs or 1)
+    results = []
+
+    with console.status("[bold cyan]Syncing Notes...[/bold cyan]") as status:
+        if jobs == 1:
+            for project in iter_projects():
+                project_name = project["slug"] or "Unknown"
+                status.update(f"[bold cyan]Syncing Notes... {project_name}[/bold cyan]")
+                results.append((project_name, project["root"], sync_project_notes(project, vault_projects_dir)))
+        else:
+            # Discovery keeps streaming projects in while the pool is already syncing earlier ones.
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                futures = {}
+                for project in iter_projects():
+                    project_name = project["slug"] or "Unknown"
+                    futures[pool.submit(sync_project_notes, project, vault_projects_dir)] = (project_name, project["root"])
+                for done, future in enumerate(as_completed(futures), 1):
+                    project_name, root = futures[future]
+                    status.update(f"[bold cyan]Syncing Notes... {done}/{len(futures)} ({jobs} jobs)[/bold cyan]")
+                    results.append((project_name, root, future.result()))
+
+    # Completion order is arbitrary with --jobs, so the table is always built in slug/file order.
     total_changes = 0
-    
-    with console.status("[bold cyan]Syncing Notes...[/bold cyan]"):
-        for root, dirs, files in os.walk(PROJECTS_PATH):
-            if ".project_meta.json" in files:
-                meta_path = os.path.join(root, ".project_meta.json")
-                try:
-                    with open(meta_path, "r", encoding="utf-8-sig") as f: meta = json.load(f)
-                except: continue
-                
-                project_name = meta.get("slug", "Unknown")
-                notes_project = os.path.join(root, "00_Notes")
-                notes_vault = os.path.join(vault_projects_dir, project_name)
-
-                logs = sync_two_folders(notes_project, notes_vault)
-                
-                for log in logs:
-                    symbol = "✅"
-                    if log["type"] == "push": symbol = "→ [green]Push[/green]"
-                    elif log["type"] == "pull": symbol = "← [blue]Pull[/blue]"
-                    elif log["type"] == "error": symbol = "❌ [red]Error[/red]"
-                    elif log["type"] == "conflict": symbol = "⚠️ [yellow]Conflict[/yellow]"
-                    
-                    changes_table.add_row(project_name, symbol, log["file"])
-                    total_changes += 1
+    for project_name, _, logs in sorted(results, key=lambda r: (r[0], r[1])):
+        for log in sorted(logs, key=lambda l: l["file"]):
+            changes_table.add_row(project_name, sync_log_symbol(log["type"]), log["file"])
+            total_changes += 1
 
     if total_changes == 0:
         console.print("[success]✅ Everything is up to date.[/success]")
@@ -454,38 +1881,34 @@ def cmd_sync(args):
         console.print(changes_table)
         console.print(f"[success]✨ Sync Complete. {total_changes} operations.[/success]")
 
+    if args.watch: watch_notes(vault_projects_dir)
+
 def cmd_thumbs(args):
     console.print("[bold purple]🖼️  Spinning up Thumbnail Mirror...[/bold purple]")
     gallery_root = os.path.join(ROOT_PATH, "04_Global_Assets", "Thumbnails_Mirror")
     if not os.path.exists(gallery_root): os.makedirs(gallery_root)
     
-    count = 0
-    with console.status("Mirroring..."):
-        for root, dirs, files in os.walk(PROJECTS_PATH):
-            if "02_Assets" in dirs:
-                thumb_source = os.path.join(root, "02_Assets", "Thumbnails")
-                if os.path.exists(thumb_source):
-                    project_name = os.path.basename(root)
-                    if ".project_meta.json" in files:
-                        try:
-                            with open(os.path.join(root, ".project_meta.json"), "r", encoding="utf-8-sig") as f:
-                                meta = json.load(f)
-                                project_name = meta.get("slug", project_name)
-                        except: pass
-                    
-                    for img in os.listdir(thumb_source):
-                        if img.lower().endswith(('.png', '.jpg', '.jpeg', '.webp')):
-                            src_file = os.path.join(thumb_source, img)
-                            ts = os.path.getmtime(src_file)
-                            date_str = datetime.datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
-                            new_name = f"{date_str}_{project_name}_{img}"
-                            dst_file = os.path.join(gallery_root, new_name)
-                            if not os.path.exists(dst_file):
-                                shutil.copy2(src_file, dst_file)
-                                count += 1
-                                console.print(f"  -> Mirrored: [cyan]{new_name}[/cyan]")
+    start = time.perf_counter()
+    stats = mirror_thumbnails(gallery_root, iter_projects(), full=args.full, jobs=args.jobs)
     
-    console.print(f"[success]✨ Gallery Updated. {count} new thumbnails.[/success]")
+    for src, e in stats["failed"]: console.print(f"[error]   ❌ Could not mirror {src}: {e}[/error]")
+    console.print(f"[success]✨ Gallery Updated. {stats['new']} new thumbnails.[/success] [dim]({time.perf_counter() - start:.2f}s, {stats['skipped']} unchanged folders skipped)[/dim]")
+    if stats["files"]:
+        secs = max(stats["seconds"], 1e-6)
+        console.print(f"[dim]   {stats['files']} images processed in {stats['seconds']:.2f}s: {stats['files'] / secs:,.0f} files/s, {stats['bytes'] / secs / (1024 * 1024):,.1f} MB/s[/dim]")
+    if stats["new"] > stats["stored"]: console.print(f"[dim]   {stats['new'] - stats['stored']} reuse images already in the store (hardlinked, no extra space).[/dim]")
+    if stats["removed"]: console.print(f"[dim]   {stats['removed']} stale gallery names removed, {stats['pruned']} unused blobs freed.[/dim]")
+
+    if args.previews:
+        if Image is None:
+            console.print("[warning]⚠️  Previews need Pillow: pip install Pillow[/warning]")
+        else:
+            sources = load_thumb_index(gallery_root)["sources"]
+            rendered, failed, previews = build_previews(gallery_root, sources, args.jobs)
+            names = {entry["hash"]: entry["name"] for entry in sources.values()}
+            for blob, e in failed: console.print(f"[error]   ❌ Preview failed for {names.get(os.path.basename(blob).split('.')[0], blob)}: {type(e).__name__}[/error]")
+            pages = write_contact_sheets(gallery_root, sources, previews)
+            console.print(f"[success]🗂️  {rendered} previews rendered. Contact sheet: {pages} page(s) → {CONTACT_SHEET_NAME}.md[/success]")
     os.startfile(gallery_root)
 
 def cmd_clone(args):
@@ -570,6 +1993,7 @@ def cmd_clone(args):
     }
     with open(os.path.join(target_dir, ".project_meta.json"), "w") as f:
         json.dump(meta, f, indent=4)
+    registry_add(target_dir, meta)
 
     console.print(Panel(f"Clone Complete!\n[path]{target_dir}[/path]", style="success"))
 
@@ -581,58 +2005,65 @@ def cmd_clean(args):
         console.print(f"[error]❌ Error: Path not found: {target_path}[/error]")
         return
 
-    MAPPING = {
-        "_Images": [".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".tiff", ".bmp"],
-        "_Video": [".mp4", ".mov", ".avi", ".mkv", ".webm", ".flv", ".wmv"],
-        "_Audio": [".mp3", ".wav", ".aac", ".flac", ".ogg", ".m4a"],
-        "_Docs": [".pdf", ".docx", ".txt", ".xlsx", ".pptx", ".csv", ".md"],
-        "_Installers": [".exe", ".msi", ".iso", ".dmg"],
-        "_Archives": [".zip", ".rar", ".7z", ".tar", ".gz"],
-        "_Fonts": [".ttf", ".otf", ".woff", ".woff2"],
-        "_3D": [".blend", ".fbx", ".obj", ".stl", ".gltf"]
-    }
-
-    results_table = Table(title="Cleanup Summary", box=box.SIMPLE)
-    results_table.add_column("File", style="white")
-    results_table.add_column("Moved To", style="cyan")
-
-    count = 0
-    for item in os.listdir(target_path):
-        if item.startswith("."): continue 
-
-        item_path = os.path.join(target_path, item)
-
-        if os.path.isfile(item_path):
-            ext = os.path.splitext(item)[1].lower()
-            target_folder = None
-
-            for folder, extensions in MAPPING.items():
-                if ext in extensions:
-                    target_folder = folder
-                    break
-
-            if not target_folder:
-                target_folder = "_Other"
-
-            if target_folder:
-                dest_dir = os.path.join(target_path, target_folder)
-                if not os.path.exists(dest_dir): os.makedirs(dest_dir)
-
-                try:
-                    shutil.move(item_path, os.path.join(dest_dir, item))
-                    count += 1
-                    results_table.add_row(item, target_folder)
-                except Exception as e:
-                    console.print(f"[error]⚠️ Could not move {item}: {e}[/error]")
-
+    start = time.perf_counter()
+    conn = open_registry() if args.sniff or CLEAN_SNIFF else None
+    try:
+        with console.status("Sorting..."):
+            batches = plan_clean(target_path, compile_clean_rules(CLEAN_RULES), conn)
+            moved, problems = apply_clean(target_path, batches)
+    finally:
+        if conn:
+            conn.commit()
+            conn.close()
+
+    for name, reason in problems[:20]: console.print(f"[error]⚠️ Could not move {name}: {reason}[/error]")
+    if len(problems) > 20: console.print(f"[error]   ...and {len(problems) - 20} more.[/error]")
+
+    count = sum(moved.values())
     if count > 0:
+        results_table = Table(title="Cleanup Summary", box=box.SIMPLE)
+        results_table.add_column("Moved To", style="cyan")
+        results_table.add_column("Files", justify="right")
+        for folder, n in sorted(moved.items(), key=lambda kv: -kv[1]): results_table.add_row(folder, str(n))
         console.print(results_table)
-        console.print(f"[success]✨ Cleanup Complete. {count} files moved.[/success]")
+        console.print(f"[success]✨ Cleanup Complete. {count} files moved in {time.perf_counter() - start:.2f}s.[/success]")
     else:
         console.print("[info]No files needed moving.[/info]")
 
     os.startfile(target_path)
 
+def plan_inbox(inbox_path, jobs=None):
+    """Dates every inbox item concurrently and works out where each one goes.
+
+    Each destination month folder is listed once; free _vN names are then
+    picked in memory, so items filed in the same run never collide either.
+    Returns [(item, src, dest, "YYYY/MM - Month")].
+    """
+    with os.scandir(inbox_path) as it: items = sorted(e.name for e in it)
+    with ThreadPoolExecutor(max_workers=jobs or COPY_JOBS) as pool:
+        stamps = list(pool.map(lambda item: get_smart_date(os.path.join(inbox_path, item)), items))
+
+    taken, plan = {}, []
+    for item, smart_ts in zip(items, stamps):
+        date_obj = datetime.datetime.fromtimestamp(smart_ts)
+        year = date_obj.strftime("%Y")
+        month_folder = date_obj.strftime("%m - %B")
+        dest_dir = os.path.join(EXPORTS_PATH, year, month_folder)
+        if dest_dir not in taken:
+            try:
+                with os.scandir(dest_dir) as it: taken[dest_dir] = {e.name.lower() for e in it}
+            except FileNotFoundError: taken[dest_dir] = set()
+
+        name = item
+        base, ext = os.path.splitext(item)
+        counter = 2
+        while name.lower() in taken[dest_dir]:
+            name = f"{base}_v{counter}{ext}"
+            counter += 1
+        taken[dest_dir].add(name.lower())
+        plan.append((item, os.path.join(inbox_path, item), os.path.join(dest_dir, name), f"{year}/{month_folder}"))
+    return plan
+
 def cmd_sort_exports(args):
     inbox_path = os.path.join(EXPORTS_PATH, "_Inbox")
     if not os.path.exists(inbox_path):
@@ -647,34 +2078,76 @@ def cmd_sort_exports(args):
         console.print("[success]✅ Inbox is empty.[/success]")
         return
     
-    count = 0
-    for item in os.listdir(inbox_path):
-        src_path = os.path.join(inbox_path, item)
-        smart_ts = get_smart_date(src_path)
-        date_obj = datetime.datetime.fromtimestamp(smart_ts)
-        year = date_obj.strftime("%Y")
-        month_folder = date_obj.strftime("%m - %B")
-        
-        dest_dir = os.path.join(EXPORTS_PATH, year, month_folder)
-        if os.path.isdir(src_path): dest_path = os.path.join(dest_dir, item)
-        else: dest_path = os.path.join(dest_dir, item)
-        
-        parent_dir = os.path.dirname(dest_path)
-        if not os.path.exists(parent_dir): os.makedirs(parent_dir)
-        
-        base, ext = os.path.splitext(dest_path)
-        counter = 2
-        while os.path.exists(dest_path):
-            dest_path = f"{base}_v{counter}{ext}"
-            counter += 1
-            
-        try:
-            shutil.move(src_path, dest_path)
-            count += 1
-            console.print(f"  -> Filed: {item} into [cyan]{year}/{month_folder}[/cyan]")
-        except Exception as e: console.print(f"  [error]❌ Error: {e}[/error]")
-    
-    console.print(f"[success]✨ Sorted {count} items.[/success]")
+    start = time.perf_counter()
+    with console.status("Dating items..."): plan = plan_inbox(inbox_path, args.jobs)
+    dated = time.perf_counter() - start
+
+    filed = {}
+    made = set()
+    with console.status(f"Filing {len(plan)} items..."):
+        for item, src_path, dest_path, label in plan:
+            dest_dir = os.path.dirname(dest_path)
+            if dest_dir not in made:
+                os.makedirs(dest_dir, exist_ok=True)
+                made.add(dest_dir)
+            try:
+                # The inbox lives inside EXPORTS_PATH, so this is normally a plain rename.
+                try: os.rename(src_path, dest_path)
+                except OSError: shutil.move(src_path, dest_path)
+                filed[label] = filed.get(label, 0) + 1
+            except Exception as e: console.print(f"  [error]❌ Error filing {item}: {e}[/error]")
+
+    for label, n in sorted(filed.items()): console.print(f"  -> Filed: {n} item{'s' if n != 1 else ''} into [cyan]{label}[/cyan]")
+    count = sum(filed.values())
+    console.print(f"[success]✨ Sorted {count} items.[/success] [dim](dated in {dated:.2f}s, {time.perf_counter() - start:.2f}s total)[/dim]")
+
+def cmd_dedupe(args):
+    targets = [os.path.abspath(p) for p in args.paths] if args.paths else default_dedupe_targets()
+    targets = [t for t in targets if os.path.isdir(t)]
+    if not targets:
+        console.print("[warning]Nothing to scan. Pass folders to check, e.g. cos dedupe \"E:\\Downloads\\_Video\"[/warning]")
+        return
+
+    console.print("[bold cyan]🔍 Looking for duplicates in:[/bold cyan]")
+    for t in targets: console.print(f"   [path]{t}[/path]")
+    start = time.perf_counter()
+    with console.status("Listing files..."): files = collect_dedupe_files(targets)
+    with console.status(f"Comparing {len(files)} files..."): groups = find_duplicates(files, args.jobs)
+
+    if not groups:
+        console.print(f"[success]✅ No duplicates among {len(files)} files.[/success] [dim]({time.perf_counter() - start:.2f}s)[/dim]")
+        return
+
+    groups.sort(key=lambda g: -g[0][1].st_size * (len(g) - 1))
+    reclaimable = sum(g[0][1].st_size * (len(g) - 1) for g in groups)
+    table = Table(title="Duplicates", box=box.SIMPLE)
+    table.add_column("Keep", style="green")
+    table.add_column("Duplicates", style="yellow")
+    table.add_column("Reclaimable", justify="right")
+    label = lambda path: os.path.relpath(path, os.path.dirname(dedupe_target_of(path, targets)))
+    for g in groups[:20]:
+        table.add_row(label(g[0][0]), "\n".join(label(p) for p, _ in g[1:]), format_size(g[0][1].st_size * (len(g) - 1)))
+    console.print(table)
+    if len(groups) > 20: console.print(f"[dim]   ...and {len(groups) - 20} more groups.[/dim]")
+    dup_count = sum(len(g) - 1 for g in groups)
+    console.print(f"[bold]{dup_count} duplicate files in {len(groups)} groups, {format_size(reclaimable)} reclaimable.[/bold] [dim]({len(files)} files checked in {time.perf_counter() - start:.2f}s)[/dim]")
+
+    mode = "link" if args.link else "trash" if args.trash else None
+    if not mode:
+        console.print("[info]Run again with --link to hardlink duplicates to the kept copy, or --trash to move them into _Duplicates.[/info]")
+        return
+
+    done, freed = 0, 0
+    for g in groups:
+        keeper = g[0][0]
+        for dup, st in g[1:]:
+            try:
+                collapse_duplicate(keeper, dup, mode, targets)
+                done += 1
+                freed += st.st_size
+            except OSError as e: console.print(f"[error]⚠️ {os.path.basename(dup)}: {e}[/error]")
+    if mode == "link": console.print(f"[success]✨ {done} duplicates hardlinked, {format_size(freed)} freed.[/success]")
+    else: console.print(f"[success]✨ {done} duplicates moved to {DEDUPE_TRASH_NAME}. Delete those folders to free {format_size(freed)}.[/success]")
 
 def cmd_travel(args):
     """Copies the current project to the External Shuttle Drive."""
@@ -694,17 +2167,62 @@ def cmd_travel(args):
     rel_path = os.path.relpath(project_root, PROJECTS_PATH)
     dest_path = os.path.join(SHUTTLE_PATH, "Projects", rel_path)
 
+    if args.return_trip: return travel_return(project_root, dest_path, args)
+
     console.print(f"Source: [path]{project_root}[/path]")
     console.print(f"Target: [path]{dest_path}[/path]")
+
+    with console.status("[cyan]Comparing with shuttle manifest...[/cyan]"):
+        src_stats, src_dirs = scan_tree(project_root)
+        src_stats = {rel: st for rel, st in src_stats.items() if not is_travel_artifact(rel)}
+        dst_stats, dst_dirs = scan_tree(dest_path) if os.path.isdir(dest_path) else ({}, [])
+        manifest = {} if args.full else load_travel_manifest(dest_path)
+        changed = plan_travel_delta(project_root, dest_path, src_stats, dst_stats, manifest, args.checksum)
+        removed = [rel for rel in dst_stats if rel not in src_stats and not is_travel_artifact(rel)] if args.mirror else []
+
+    changed_bytes = sum(src_stats[rel].st_size for rel in changed)
+    console.print(f"Delta:  {len(changed)} of {len(src_stats)} files changed ({changed_bytes / (1024 * 1024):,.1f} MB)" + (f", {len(removed)} to delete" if args.mirror else ""))
+
+    if not changed and not removed:
+        if args.checksum and manifest: save_travel_manifest(dest_path, manifest)
+        console.print("[success]✅ Shuttle copy is already up to date.[/success]")
+        return
     
     if not Confirm.ask("Start copy? This might take a while for video."): return
 
     try:
-        copy_with_progress(project_root, dest_path)
+        result, copied = None, set()
+        try: result = copy_with_progress(project_root, dest_path, files=changed, jobs=args.jobs, verify=args.verify, done=copied)
+        finally:
+            # Record only files that finished copying, so an interrupted trip resumes where it
+            # stopped without trusting a stale shuttle copy that merely has the right size.
+            for rel in changed:
+                if rel not in copied: continue
+                try: dst_st = os.stat(os.path.join(dest_path, rel))
+                except OSError: continue
+                st = src_stats[rel]
+                if dst_st.st_size != st.st_size: continue
+                manifest[manifest_key(rel)] = {
+                    "size": st.st_size, "mtime_ns": st.st_mtime_ns, "dst_mtime_ns": dst_st.st_mtime_ns,
+                    "hash": hash_file(os.path.join(project_root, rel)) if args.checksum else None
+                }
+            for key in [k for k in manifest if os.path.join(*k.split("/")) not in src_stats]: del manifest[key]
+            save_travel_manifest(dest_path, manifest)
+
+        if result["failed"]:
+            console.print(f"[error]❌ {len(result['failed'])} files failed to copy. Run travel again to retry them.[/error]")
+            return
+
+        for rel in removed: os.remove(os.path.join(dest_path, rel))
+        if args.mirror:
+            for rel in sorted(dst_dirs, key=len, reverse=True):
+                if rel not in src_dirs:
+                    try: os.rmdir(os.path.join(dest_path, rel))
+                    except OSError: pass
         
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with open(os.path.join(dest_path, "_TRAVEL_LOG.txt"), "a") as f:
-            f.write(f"Synced from Desktop at: {timestamp}\n")
+        with open(os.path.join(dest_path, TRAVEL_LOG_NAME), "a") as f:
+            f.write(f"Synced from Desktop at: {timestamp} ({len(changed)} copied, {len(removed)} deleted)\n")
             
         console.print(Panel(f"Project ready for travel!\n[path]{dest_path}[/path]", title="✅ Launch Successful", style="success"))
         console.print("   [info]Don't forget to Eject safely.[/info]")
@@ -713,6 +2231,95 @@ def cmd_travel(args):
     except Exception as e:
         console.print(f"[error]❌ Copy failed: {e}[/error]")
 
+def travel_return(project_root, dest_path, args):
+    """Brings edits made on the shuttle back into the desktop project.
+
+    The manifest from the last trip tells which side moved since then: files
+    changed only on the shuttle are copied back, files changed on both sides (or
+    differing with no manifest entry to tell) are conflicts (newest wins, a
+    replaced desktop copy is kept as .bak, like sync), and nothing is ever
+    deleted on the desktop. Only files missing on the desktop are copied back
+    without a backup.
+    """
+    console.print(f"Shuttle: [path]{dest_path}[/path]")
+    console.print(f"Project: [path]{project_root}[/path]")
+
+    if not os.path.isdir(dest_path):
+        console.print("[error]❌ This project has never travelled to this shuttle drive.[/error]")
+        return
+
+    with console.status("[cyan]Comparing shuttle and desktop...[/cyan]"):
+        manifest = load_travel_manifest(dest_path)
+        src_stats, _ = scan_tree(project_root)
+        dst_stats, _ = scan_tree(dest_path)
+
+        plan = []  # (rel, action, note)
+        for rel, dst in sorted(dst_stats.items()):
+            if is_travel_artifact(rel): continue
+            entry = manifest.get(manifest_key(rel))
+            src = src_stats.get(rel)
+            if entry and dst.st_size == entry["size"] and dst.st_mtime_ns == entry.get("dst_mtime_ns"): continue
+
+            if src is None:
+                if entry is None: plan.append((rel, "new", "New on shuttle"))
+                else: plan.append((rel, "conflict", "Edited on shuttle, deleted on desktop. Restored."))
+            elif entry is None:
+                # No record of this file from a trip (an older shuttle, or created on both sides):
+                # there's no telling which side changed, so treat a difference as a conflict like sync does.
+                if src.st_size == dst.st_size and hash_file(os.path.join(project_root, rel)) == hash_file(os.path.join(dest_path, rel)):
+                    continue
+                if dst.st_mtime > src.st_mtime: plan.append((rel, "conflict", "Differs on both sides, no trip record. Shuttle newer: kept, desktop backed up."))
+                else: plan.append((rel, "keep", "Differs on both sides, no trip record. Desktop newer: kept."))
+            elif src.st_size == entry["size"] and src.st_mtime_ns == entry["mtime_ns"]:
+                plan.append((rel, "update", "Updated on shuttle"))
+            elif hash_file(os.path.join(project_root, rel)) == hash_file(os.path.join(dest_path, rel)):
+                continue
+            elif dst.st_mtime > src.st_mtime:
+                plan.append((rel, "conflict", "Edited on both sides. Shuttle kept, desktop backed up."))
+            else:
+                plan.append((rel, "keep", "Edited on both sides. Desktop kept."))
+
+    copy_back = [rel for rel, action, _ in plan if action != "keep"]
+    report = Table(show_header=True, header_style="bold magenta", box=box.SIMPLE)
+    report.add_column("Action", style="white")
+    report.add_column("File", style="dim")
+    for rel, action, note in plan:
+        symbol = "⚠️ [yellow]Conflict[/yellow]" if action in ("conflict", "keep") else "← [blue]Return[/blue]"
+        report.add_row(symbol, f"{rel} [dim]({note})[/dim]")
+
+    if not plan:
+        console.print("[success]✅ Nothing changed on the shuttle since the last trip.[/success]")
+        return
+    console.print(report)
+    if not Confirm.ask(f"Copy {len(copy_back)} files back into the project?"): return
+
+    try:
+        for rel, action, _ in plan:
+            target = os.path.join(project_root, rel)
+            if action == "conflict" and os.path.exists(target): shutil.copy2(target, target + ".bak")
+        result = copy_with_progress(dest_path, project_root, files=copy_back, jobs=args.jobs, verify=args.verify)
+    except Exception as e:
+        console.print(f"[error]❌ Return copy failed: {e}[/error]")
+        return
+    if result["failed"]:
+        console.print(f"[error]❌ {len(result['failed'])} files failed to copy back. Nothing was recorded; run --return again.[/error]")
+        return
+
+    for rel in copy_back:
+        src, dst = os.stat(os.path.join(project_root, rel)), dst_stats[rel]
+        manifest[manifest_key(rel)] = {"size": src.st_size, "mtime_ns": src.st_mtime_ns, "dst_mtime_ns": dst.st_mtime_ns, "hash": None}
+    save_travel_manifest(dest_path, manifest)
+
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with open(os.path.join(project_root, RETURN_REPORT_NAME), "w", encoding="utf-8") as f:
+        f.write(f"Returned from shuttle at: {timestamp}\nShuttle: {dest_path}\n\n")
+        for rel, action, note in plan: f.write(f"[{action.upper()}] {manifest_key(rel)} - {note}\n")
+    with open(os.path.join(dest_path, TRAVEL_LOG_NAME), "a") as f:
+        f.write(f"Returned to Desktop at: {timestamp} ({len(copy_back)} copied back)\n")
+
+    conflicts = sum(1 for _, action, _ in plan if action in ("conflict", "keep"))
+    console.print(Panel(f"{len(copy_back)} files returned, {conflicts} conflicts.\nReport: [path]{os.path.join(project_root, RETURN_REPORT_NAME)}[/path]", title="✅ Welcome Home", style="success"))
+
 def remove_readonly(func, path, excinfo):
     os.chmod(path, stat.S_IWRITE)
     func(path)
@@ -728,59 +2335,120 @@ def robust_rmtree(path, retries=5, delay=1):
     console.print(f"[error]❌ Failed to remove directory after {retries} retries: {path}[/error]")
     return False
 
+def move_tree(src, dst, jobs=None):
+    """Moves a project folder to dst using the cheapest safe route.
+
+    On the same volume this is a single atomic os.rename. Otherwise the tree is
+    copied with verification into a `<dst>.cos_partial` staging folder, the
+    staging folder is renamed into place, and only then is the source deleted.
+    If a previous attempt crashed, files already in staging with the right size
+    and mtime are kept rather than copied again, and anything staged that is no
+    longer in the source is deleted, so dst ends up matching src exactly.
+
+    Returns "renamed", "moved", "copied" (in place, but the source couldn't be
+    removed) or "failed" (source untouched, staging kept for the next attempt).
+    """
+    parent = os.path.dirname(dst)
+    os.makedirs(parent, exist_ok=True)
+    if os.stat(src).st_dev == os.stat(parent).st_dev:
+        try:
+            os.rename(src, dst)
+            return "renamed"
+        except OSError: pass  # e.g. a file is open on Windows; the copy route reports it properly
+
+    staging = dst + STAGING_SUFFIX
+    src_stats, src_dirs = scan_tree(src)
+    staged, staged_dirs = scan_tree(staging) if os.path.isdir(staging) else ({}, [])
+    # Half-copied large files (<name>.cos_partial) are kept so copy_file_fast can resume them.
+    def resumable(rel):
+        base = src_stats.get(rel[:-len(STAGING_SUFFIX)]) if rel.endswith(STAGING_SUFFIX) else None
+        return base is not None and base.st_size >= COPY_LARGE_FILE
+    for rel in [rel for rel in staged if rel not in src_stats and not resumable(rel)]:
+        os.remove(os.path.join(staging, rel))
+        del staged[rel]
+    for rel in sorted(set(staged_dirs) - set(src_dirs), key=len, reverse=True): os.rmdir(os.path.join(staging, rel))
+    todo = [
+        rel for rel, st in src_stats.items()
+        if not (rel in staged and staged[rel].st_size == st.st_size and staged[rel].st_mtime_ns == st.st_mtime_ns)
+    ]
+    if staged: console.print(f"   [info]Resuming interrupted move: {len(src_stats) - len(todo)} files already staged.[/info]")
+
+    result = copy_with_progress(src, staging, files=todo, jobs=jobs, verify=True)
+    if result["failed"]: return "failed"
+    for rel in src_dirs: os.makedirs(os.path.join(staging, rel), exist_ok=True)
+
+    os.rename(staging, dst)
+    return "moved" if robust_rmtree(src) else "copied"
+
 def cmd_resurrect(args):
     """Brings a project back from the dead (Archive -> Active)."""
-    search_term = args.name.lower()
     console.print(f"🔎 Searching Archive for: '[cyan]{args.name}[/cyan]'...")
     
     if not os.path.exists(ARCHIVE_PATH):
         console.print(f"[error]Error: Archive path not found: {ARCHIVE_PATH}[/error]")
         return
 
-    # 1. Search for matching folders
-    matches = []
-    with console.status("Scanning Archive..."):
-        for root, dirs, files in os.walk(ARCHIVE_PATH):
-            for d in dirs:
-                if search_term in d.lower():
-                    matches.append(os.path.join(root, d))
-            if root.count(os.sep) - ARCHIVE_PATH.count(os.sep) > 1:
-                del dirs[:]
+    # 1. Search the catalog
+    conn = open_registry()
+    try:
+        with console.status("Updating archive catalog..."):
+            if args.reindex: reset_archive_catalog(conn)
+            refresh_archive_catalog(conn)
+        matches = search_archive(conn, args.name)
+    finally: conn.close()
 
     if not matches:
         console.print("[warning]No matching projects found in Archive.[/warning]")
         return
 
     # 2. Select Project
-    selected_path = matches[0]
+    selected = matches[0]
     if len(matches) > 1:
         console.print("[bold]Multiple matches found:[/bold]")
         for i, m in enumerate(matches):
-            console.print(f"   [green]{i+1}.[/green] {m}")
+            details = f"{m['type']}, {m['client']}, {format_size(m['size'])}" if m["kind"] == "project" else "folder"
+            console.print(f"   [green]{i+1}.[/green] {m['path']} [dim]({details})[/dim]")
         
         choice = IntPrompt.ask("Select project number", choices=[str(i+1) for i in range(len(matches))])
-        selected_path = matches[int(choice) - 1]
+        selected = matches[int(choice) - 1]
+    elif selected["score"] < 2.0 and not Confirm.ask(f"Closest match is [bold]{selected['path']}[/bold]. Resurrect it?"):
+        return
+    selected_path = selected["path"]
+    is_bundle = selected["kind"] == "bundle"
+
+    if is_bundle and args.list: return list_bundle(selected_path)
+    if is_bundle and args.file:
+        target = args.to or os.getcwd()
+        try: extracted = extract_bundle(selected_path, target, args.file)
+        except ValueError as e: return console.print(f"[error]❌ {e}[/error]")
+        console.print(f"[success]✨ Extracted {len(extracted)} files into [path]{target}[/path][/success]")
+        return
+    if not is_bundle and (args.list or args.file):
+        console.print("[warning]--list/--file only apply to archive bundles; this is a plain folder.[/warning]")
+        return
 
     project_name = os.path.basename(selected_path)
+    if is_bundle: project_name = project_name[:-len(BUNDLE_SUFFIX)]
     console.print(f"✨ Resurrecting: [bold]{project_name}[/bold]")
 
     # 3. Determine Destination
     category = "Video" # Default
     meta_path = os.path.join(selected_path, ".project_meta.json")
     
-    if os.path.exists(meta_path):
+    if is_bundle or os.path.exists(meta_path):
         try:
-            with open(meta_path, "r", encoding="utf-8-sig") as f:
-                meta = json.load(f)
-                category = meta.get("type", "Video")
-                if meta.get("client") and meta.get("client") != "None":
-                    dest_root = os.path.join(PROJECTS_PATH, "Clients", meta["client"])
-                else:
-                    if category.lower() in ["web", "code"]: dest_cat = "Code"
-                    elif category.lower() in ["music", "audio"]: dest_cat = "Music"
-                    elif category.lower() == "ai": dest_cat = "AI"
-                    else: dest_cat = "Video"
-                    dest_root = os.path.join(PROJECTS_PATH, dest_cat)
+            if is_bundle: meta = read_bundle_meta(selected_path) or {}
+            else:
+                with open(meta_path, "r", encoding="utf-8-sig") as f: meta = json.load(f)
+            category = meta.get("type", "Video")
+            if meta.get("client") and meta.get("client") != "None":
+                dest_root = os.path.join(PROJECTS_PATH, "Clients", meta["client"])
+            else:
+                if category.lower() in ["web", "code"]: dest_cat = "Code"
+                elif category.lower() in ["music", "audio"]: dest_cat = "Music"
+                elif category.lower() == "ai": dest_cat = "AI"
+                else: dest_cat = "Video"
+                dest_root = os.path.join(PROJECTS_PATH, dest_cat)
         except:
             dest_root = os.path.join(PROJECTS_PATH, "Video")
     else:
@@ -794,14 +2462,86 @@ def cmd_resurrect(args):
         return
 
     try:
-        copy_with_progress(selected_path, final_dest)
-        
-        console.print("removing from archive...")
-        if robust_rmtree(selected_path):
+        if is_bundle:
+            staging = final_dest + STAGING_SUFFIX
+            with console.status("Unpacking bundle..."): extract_bundle(selected_path, staging)
+            os.rename(staging, final_dest)
+            outcome = "moved"
+            try: os.remove(selected_path)
+            except OSError: outcome = "copied"
+        else: outcome = move_tree(selected_path, final_dest, jobs=args.jobs)
+        if outcome == "failed":
+            console.print(Panel(f"Some files did not verify. The archive copy was left untouched.\n[path]{selected_path}[/path]", title="❌ Verification Failed", style="error"))
+            return
+
+        conn = open_registry()
+        conn.execute("DELETE FROM archive WHERE path = ?", (selected_path,))
+        conn.commit()
+        conn.close()
+        if outcome == "copied":
+            console.print(f"[warning]❌ Could not remove from archive. Copied safely to Active.[/warning]")
+        else:
             console.print(Panel(f"Project moved to:\n[path]{final_dest}[/path]", title="✨ LIVE!", style="success"))
             os.startfile(final_dest)
+    except Exception as e:
+        console.print(f"[error]❌ An unexpected error occurred: {e}[/error]")
+
+def cmd_archive(args):
+    """Sends a finished project to the Archive (Active -> Archive)."""
+    with console.status("Looking up project..."):
+        projects = registry_projects()
+    term = args.slug.lower()
+    matches = [p for p in projects if (p["slug"] or "").lower() == term]
+    if not matches: matches = [p for p in projects if term in (p["slug"] or "").lower() or term in (p["name"] or "").lower()]
+
+    if not matches:
+        console.print(f"[warning]No active project matches '{args.slug}'.[/warning]")
+        return
+    project = matches[0]
+    if len(matches) > 1:
+        console.print("[bold]Multiple matches found:[/bold]")
+        for i, m in enumerate(matches):
+            console.print(f"   [green]{i+1}.[/green] {m['slug']} [dim]({m['root']})[/dim]")
+        choice = IntPrompt.ask("Select project number", choices=[str(i+1) for i in range(len(matches))])
+        project = matches[int(choice) - 1]
+
+    source = project["root"]
+    final_dest = os.path.join(ARCHIVE_PATH, os.path.relpath(source, PROJECTS_PATH))
+    if args.bundle: final_dest += BUNDLE_SUFFIX
+    console.rule(f"[bold purple]📦 Archiving: {project['name']}")
+    console.print(f"Source: [path]{source}[/path]")
+    console.print(f"Target: [path]{final_dest}[/path]")
+
+    if not os.path.exists(ARCHIVE_PATH):
+        console.print(f"[error]Error: Archive path not found: {ARCHIVE_PATH}[/error]")
+        return
+    if os.path.exists(final_dest):
+        console.print(f"[warning]Warning: Archive already contains: {final_dest}[/warning]")
+        return
+    if os.path.normcase(os.getcwd()).startswith(os.path.normcase(source)):
+        console.print("[warning]⚠️  You are inside this project. cd out of it first so the folder can be moved.[/warning]")
+        return
+    if not Confirm.ask("Move this project to the archive?"): return
+
+    try:
+        if args.bundle:
+            original = tree_size(source) or 0
+            bundled = create_bundle(source, final_dest)
+            console.print(f"   [dim]{format_size(original)} -> {format_size(bundled)} ({bundled / max(original, 1):.0%})[/dim]")
+            outcome = "moved" if robust_rmtree(source) else "copied"
+        else: outcome = move_tree(source, final_dest, jobs=args.jobs)
+        if outcome == "failed":
+            console.print(Panel(f"Some files did not verify. The project was left in place.\n[path]{source}[/path]", title="❌ Verification Failed", style="error"))
+            return
+
+        conn = open_registry()
+        conn.execute("DELETE FROM projects WHERE root = ?", (source,))
+        conn.commit()
+        conn.close()
+        if outcome == "copied":
+            console.print(f"[warning]❌ Could not remove the active copy. Archived safely to:[/warning] [path]{final_dest}[/path]")
         else:
-             console.print(f"[warning]❌ Could not remove from archive. Copied safely to Active.[/warning]")
+            console.print(Panel(f"Project archived to:\n[path]{final_dest}[/path]", title="📦 Archived", style="success"))
     except Exception as e:
         console.print(f"[error]❌ An unexpected error occurred: {e}[/error]")
 
@@ -834,8 +2574,10 @@ def main():
         table.add_row("export", "Open Export Folder")
         table.add_row("thumbs", "Update Thumbnail Gallery")
         table.add_row("clean", "Sort Downloads")
+        table.add_row("dedupe", "Collapse duplicate downloads & exports")
         table.add_row("travel", "Copy to Shuttle Drive")
         table.add_row("resurrect", "Restore from Archive")
+        table.add_row("archive <slug>", "Move project to Archive")
         
         console.print(table)
         console.print("\nUse [bold]cos <command> -h[/bold] for flags.")
@@ -871,14 +2613,46 @@ def main():
     p_exp.add_argument("-s", "--simple", action="store_true")
 
     # --- UTILS ---
-    subparsers.add_parser("sync", help="Sync Notes")
-    subparsers.add_parser("thumbs", help="Update Gallery")
-    subparsers.add_parser("clean", help="Sort Downloads")
-    subparsers.add_parser("sort-exports", help="Sort Inbox")
-    subparsers.add_parser("travel", help="Copy to Shuttle")
+    p_sync = subparsers.add_parser("sync", help="Sync Notes")
+    p_sync.add_argument("-j", "--jobs", type=int, default=1, help="Sync this many projects in parallel")
+    p_sync.add_argument("-w", "--watch", action="store_true", help="Keep running and sync notes as they change")
+    p_thumbs = subparsers.add_parser("thumbs", help="Update Gallery")
+    p_thumbs.add_argument("--full", action="store_true", help="List every thumbnail folder, even ones whose mtime hasn't changed")
+    p_thumbs.add_argument("-j", "--jobs", type=int, help="Parallel mirroring workers (default: copy_jobs)")
+    p_thumbs.add_argument("--previews", action="store_true", help="Render small previews and a Markdown contact sheet (needs Pillow)")
+    p_clean = subparsers.add_parser("clean", help="Sort Downloads")
+    p_clean.add_argument("target", nargs="?", help="Folder to clean (default: downloads_path)")
+    p_clean.add_argument("--sniff", action="store_true", help="Identify unknown and extensionless files by their content")
+    p_sort = subparsers.add_parser("sort-exports", help="Sort Inbox")
+    p_sort.add_argument("-j", "--jobs", type=int, help="Items dated in parallel (default: copy_jobs)")
+    p_dedupe = subparsers.add_parser("dedupe", help="Find duplicate files")
+    p_dedupe.add_argument("paths", nargs="*", help="Folders to check (default: Downloads/_Video, Downloads/_Images and export years)")
+    p_dedupe_mode = p_dedupe.add_mutually_exclusive_group()
+    p_dedupe_mode.add_argument("--link", action="store_true", help="Replace duplicates with hardlinks to the kept copy")
+    p_dedupe_mode.add_argument("--trash", action="store_true", help="Move duplicates into a _Duplicates folder")
+    p_dedupe.add_argument("-j", "--jobs", type=int, help="Parallel hashing workers")
+    p_travel = subparsers.add_parser("travel", help="Copy to Shuttle")
+    p_travel.add_argument("-j", "--jobs", type=int, help="Parallel copy workers for small files")
+    p_travel.add_argument("--full", action="store_true", help="Ignore the shuttle manifest and recopy everything")
+    p_travel.add_argument("--checksum", action="store_true", help="Also compare content hashes, not just size and mtime")
+    p_travel.add_argument("--mirror", action="store_true", help="Delete files on the shuttle that no longer exist in the project")
+    p_travel.add_argument("--return", dest="return_trip", action="store_true", help="Merge edits made on the shuttle back into the project")
+    p_travel.add_argument("--verify", action="store_true", help="Checksum every copied file")
     
     # --- RESURRECT ---
-    subparsers.add_parser("resurrect", help="Restore from Archive").add_argument("name", type=str)
+    p_res = subparsers.add_parser("resurrect", help="Restore from Archive")
+    p_res.add_argument("name", type=str)
+    p_res.add_argument("-j", "--jobs", type=int, help="Parallel copy workers for small files")
+    p_res.add_argument("--reindex", action="store_true", help="Rebuild the archive catalog from scratch")
+    p_res.add_argument("-l", "--list", action="store_true", help="List the files inside an archive bundle")
+    p_res.add_argument("-f", "--file", action="append", help="Extract only bundle members matching this pattern (repeatable)")
+    p_res.add_argument("--to", type=str, help="Where --file extracts to (default: current folder)")
+
+    # --- ARCHIVE ---
+    p_arc = subparsers.add_parser("archive", help="Move a project to the Archive")
+    p_arc.add_argument("slug", type=str)
+    p_arc.add_argument("-j", "--jobs", type=int, help="Parallel copy workers for small files")
+    p_arc.add_argument("-b", "--bundle", action="store_true", help="Store as a compressed, indexed bundle instead of a folder")
 
     args = parser.parse_args()
 
@@ -892,8 +2666,10 @@ def main():
     elif args.command == "thumbs": cmd_thumbs(args)
     elif args.command == "clean": cmd_clean(args)
     elif args.command == "sort-exports": cmd_sort_exports(args)
+    elif args.command == "dedupe": cmd_dedupe(args)
     elif args.command == "travel": cmd_travel(args)
     elif args.command == "resurrect": cmd_resurrect(args)
+    elif args.command == "archive": cmd_archive(args)
     else: parser.print_help()
 
 if __name__ == "__main__":